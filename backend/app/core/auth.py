@@ -1,6 +1,11 @@
 from __future__ import annotations
 
+import hmac
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import Header, HTTPException
@@ -14,11 +19,90 @@ class AuthContext:
     user_id: str
 
 
+class SessionCache:
+    """
+    Short-TTL LRU of verified session tokens -> (user_id, signing time).
+
+    Lets hot clients skip the HMAC check. A hit still enforces the caller's `max_age_seconds`
+    against the token's own signing time, so caching never extends a session, and entries
+    are tied to the secret that verified them. Call `revoke_token` / `revoke_user` when a
+    session is invalidated so a cached verification doesn't outlive it.
+    """
+
+    def __init__(self) -> None:
+        self._data: OrderedDict[str, tuple[str, str, float, float]] = OrderedDict()
+        # The auth dependencies are sync, so FastAPI calls this from threadpool threads.
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str, *, secret: str, max_age_seconds: int) -> Optional[str]:
+        ttl = get_settings().session_cache_ttl_seconds
+        with self._lock:
+            item = self._data.get(token)
+            if item is None:
+                self.misses += 1
+                return None
+            user_id, item_secret, signed_at, cached_at = item
+            now = time.time()
+            if item_secret != secret or now - cached_at > ttl or not 0 <= now - signed_at <= max_age_seconds:
+                self._data.pop(token, None)
+                self.misses += 1
+                return None
+            self._data.move_to_end(token)
+            self.hits += 1
+            return user_id
+
+    def put(self, token: str, user_id: str, *, secret: str, signed_at: float) -> None:
+        settings = get_settings()
+        if settings.session_cache_max_entries <= 0 or settings.session_cache_ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._data[token] = (user_id, secret, signed_at, time.time())
+            self._data.move_to_end(token)
+            while len(self._data) > settings.session_cache_max_entries:
+                self._data.popitem(last=False)
+
+    def revoke_token(self, token: str) -> None:
+        with self._lock:
+            self._data.pop(token, None)
+
+    def revoke_user(self, user_id: str) -> None:
+        with self._lock:
+            for token in [t for t, item in self._data.items() if item[0] == user_id]:
+                del self._data[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            size, hits, misses = len(self._data), self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "size": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+        }
+
+
+session_cache = SessionCache()
+
+
 def _serializer() -> URLSafeTimedSerializer:
     settings = get_settings()
     if not settings.session_secret:
         raise RuntimeError("SESSION_SECRET is not set")
-    return URLSafeTimedSerializer(settings.session_secret, salt="studybuddy-session")
+    return _serializer_for(settings.session_secret)
+
+
+@lru_cache(maxsize=4)
+def _serializer_for(secret: str) -> URLSafeTimedSerializer:
+    # Built once per secret (i.e. per settings instance), not on every request.
+    return URLSafeTimedSerializer(secret, salt="studybuddy-session")
 
 
 def issue_session_token(user_id: str) -> str:
@@ -28,14 +112,27 @@ def issue_session_token(user_id: str) -> str:
 
 def verify_session_token(token: str, *, max_age_seconds: int = 60 * 60 * 24 * 30) -> str:
     s = _serializer()
+    secret = get_settings().session_secret
+    cached = session_cache.get(token, secret=secret, max_age_seconds=max_age_seconds)
+    if cached is not None:
+        return cached
     try:
-        data = s.loads(token, max_age=max_age_seconds)
-        user_id = data.get("user_id")
-        if not isinstance(user_id, str) or not user_id:
-            raise HTTPException(status_code=401, detail="Invalid session token")
-        return user_id
+        data, signed_at = s.loads(token, max_age=max_age_seconds, return_timestamp=True)
     except BadSignature:
         raise HTTPException(status_code=401, detail="Invalid session token")
+    user_id = data.get("user_id") if isinstance(data, dict) else None
+    if not isinstance(user_id, str) or not user_id:
+        raise HTTPException(status_code=401, detail="Invalid session token")
+    session_cache.put(token, user_id, secret=secret, signed_at=signed_at.timestamp())
+    return user_id
+
+
+def revoke_session_token(token: str) -> None:
+    session_cache.revoke_token(token)
+
+
+def revoke_user_sessions(user_id: str) -> None:
+    session_cache.revoke_user(user_id)
 
 
 def get_optional_user_id(authorization: Optional[str] = Header(default=None)) -> Optional[str]:
@@ -66,3 +163,11 @@ def require_user_id(authorization: Optional[str] = Header(default=None)) -> Auth
     return AuthContext(user_id=user_id)
 
 
+def require_admin(x_admin_key: Optional[str] = Header(default=None)) -> None:
+    settings = get_settings()
+    if not settings.admin_api_key:
+        raise HTTPException(status_code=403, detail="Admin API disabled")
+    if not x_admin_key or not hmac.compare_digest(
+        x_admin_key.encode("utf-8"), settings.admin_api_key.encode("utf-8")
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.logging import log_event
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling an upstream whose circuit is open; callers fall back as usual."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one upstream.
+
+    Closed: calls go through; `circuit_failure_threshold` failures in a row open it. Open:
+    calls fail immediately with CircuitOpenError for `circuit_reset_seconds`. Half-open: one
+    probe call is let through; success closes the circuit, failure opens it again. Only
+    upstream trouble counts (transport errors, timeouts, 429/5xx); a 401 for one user doesn't.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.rejected = 0
+        self.opened = 0
+
+    def before_call(self) -> None:
+        if self.state == CLOSED:
+            return
+        if self.state == OPEN:
+            assert self.opened_at is not None
+            if time.monotonic() - self.opened_at < get_settings().circuit_reset_seconds:
+                self._reject()
+            self.state = HALF_OPEN
+        if self.probing:
+            self._reject()
+        self.probing = True
+
+    def record(self, error: Optional[BaseException]) -> None:
+        if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+            # Abandoned call (client went away, hedge lost): says nothing about the upstream.
+            self.probing = False
+            return
+        if error is not None and is_upstream_failure(error):
+            self._failure()
+        else:
+            self._success()
+
+    def snapshot(self) -> dict:
+        out = {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+        if self.state != CLOSED and self.opened_at is not None:
+            out["open_for_seconds"] = round(time.monotonic() - self.opened_at, 1)
+        return out
+
+    def reset(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.rejected = self.opened = 0
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise CircuitOpenError(f"{self.name}_circuit_open")
+
+    def _success(self) -> None:
+        if self.state != CLOSED:
+            log_event("circuit", name=self.name, state=CLOSED)
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def _failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.state == HALF_OPEN or self.failures >= get_settings().circuit_failure_threshold:
+            if self.state != OPEN:
+                self.opened += 1
+                log_event("circuit", name=self.name, state=OPEN, failures=self.failures)
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError, TimeoutError))
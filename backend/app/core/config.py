@@ -21,8 +21,81 @@ class Settings(BaseSettings):
     google_client_secret: str = ""  # optional depending on OAuth client type
     google_redirect_uri: str = ""
     session_secret: str = ""
+    # Verified session tokens are remembered briefly so hot clients skip the HMAC check.
+    session_cache_ttl_seconds: float = 60.0
+    session_cache_max_entries: int = 4096
+    # Pending OAuth logins: "memory" (single process) or "sqlite" (shared by all workers).
+    pkce_store_backend: str = "memory"
     sqlite_path: str = "backend.sqlite3"
+    sqlite_busy_timeout_ms: int = 5000
+    token_cache_max_entries: int = 10000
+
+    # Background access-token refresh for recently active users.
+    token_refresh_interval_seconds: float = 60.0
+    token_refresh_lead_seconds: int = 600
+    token_refresh_active_window_seconds: float = 3600.0
     openai_api_key: str = ""
+    openai_model: str = "gpt-4.1-mini"
+
+    # Classroom fan-out: per-course courseWork requests run concurrently.
+    classroom_max_concurrency: int = 4
+    classroom_course_timeout_seconds: float = 8.0
+    # Incremental sync into SQLite: within max age the stored copy is served as-is; a full
+    # (non-incremental) pass per course runs periodically to pick up deletions.
+    classroom_sync_max_age_seconds: float = 120.0
+    classroom_full_sync_interval_seconds: float = 21600.0
+    # Outbound Classroom rate limits (requests/second and burst; rate <= 0 disables a bucket).
+    # Calls queue for at most max_wait; 429/503 are retried with backoff honouring Retry-After.
+    classroom_rate_global: float = 50.0
+    classroom_burst_global: float = 100.0
+    classroom_rate_per_user: float = 5.0
+    classroom_burst_per_user: float = 10.0
+    classroom_max_wait_seconds: float = 5.0
+    classroom_retry_attempts: int = 3
+    classroom_retry_base_seconds: float = 0.5
+    classroom_retry_max_seconds: float = 8.0
+
+    # Per-user assignment cache (stale entries are served while refreshing in the background).
+    assignment_cache_ttl_seconds: float = 300.0
+    assignment_cache_max_stale_seconds: float = 3600.0
+
+    # Planner: "fallback" tries the LLM then the deterministic planner; "hedged" returns the
+    # deterministic plan unless a valid LLM plan arrives within the deadline.
+    planner_mode: str = "fallback"
+    planner_deadline_seconds: float = 2.5
+    planner_hedge_background: bool = True
+
+    # Cache of LLM weekly plans keyed by (model, prompt); the disk tier is off when dir is empty
+    # and is pruned (expired, then oldest) to disk_max_entries files.
+    llm_cache_max_entries: int = 256
+    llm_cache_ttl_seconds: float = 86400.0
+    llm_cache_dir: str = ""
+    llm_cache_disk_max_entries: int = 2048
+
+    # Pooled upstream HTTP clients (one per upstream: Google, OpenAI).
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2_enabled: bool = False
+    # Per-upstream circuit breakers: this many consecutive failures make calls fail fast (and
+    # fall back) for reset_seconds, after which a single probe call decides whether to close.
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+    # Concurrent upstream calls from batch work (/plan/batch), held for a whole Classroom sync
+    # or OpenAI call; interactive requests are not capped. 0 = no cap.
+    google_max_concurrency: int = 16
+    openai_max_concurrency: int = 8
+
+    # Admin batch endpoints (/plan/batch); disabled while the key is empty.
+    admin_api_key: str = ""
+    plan_batch_max_concurrency: int = 8
+    plan_batch_max_users: int = 200
+
+    # Structured logs on stdout: "kv" (`event key=value ...`) or "json". Sample rates are
+    # "event=rate" pairs, e.g. "assignments_source=0.1"; fallbacks are always logged.
+    log_format: str = "kv"
+    log_level: str = "INFO"
+    log_sample_rates: str = ""
 
     def cors_origins_list(self) -> list[str]:
         return [s.strip() for s in self.cors_origins.split(",") if s.strip()]
@@ -1,19 +1,70 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Optional
 
 from app.core.config import get_settings
 
 
+# Connections are reused per (thread, database path); sqlite3 connections aren't safe to share
+# across threads concurrently, and WAL lets those per-thread readers run alongside the writer.
+_conns: dict[tuple[int, str], sqlite3.Connection] = {}
+_initialized: set[str] = set()
+_lock = threading.Lock()
+
+
 def get_conn() -> sqlite3.Connection:
-    settings = get_settings()
-    path = Path(settings.sqlite_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(path))
+    path = _db_path()
+    key = (threading.get_ident(), path)
+    conn = _conns.get(key)
+    if conn is None:
+        init_db()
+        conn = _connect(path)
+        with _lock:
+            _conns[key] = conn
+    return conn
+
+
+def init_db() -> None:
+    """Create the database file and schema once per path (normally at app startup)."""
+    path = _db_path()
+    if path in _initialized:
+        return
+    with _lock:
+        if path in _initialized:
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = _connect(path)
+        try:
+            # WAL is persistent in the database file, so set it once here.
+            conn.execute("PRAGMA journal_mode=WAL")
+            _init(conn)
+        finally:
+            conn.close()
+        _initialized.add(path)
+
+
+def close_all() -> None:
+    with _lock:
+        conns = list(_conns.values())
+        _conns.clear()
+        _initialized.clear()
+    for conn in conns:
+        conn.close()
+
+
+def _db_path() -> str:
+    return str(Path(get_settings().sqlite_path))
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    busy_timeout_ms = get_settings().sqlite_busy_timeout_ms
+    conn = sqlite3.connect(path, timeout=busy_timeout_ms / 1000, check_same_thread=False)
     conn.row_factory = sqlite3.Row
-    _init(conn)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
     return conn
 
 
@@ -31,6 +82,68 @@ def _init(conn: sqlite3.Connection) -> None:
         )
         """
     )
+    # Local Classroom mirror for incremental sync (see app/services/coursework_store.py).
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS coursework (
+          user_id TEXT NOT NULL,
+          course_id TEXT NOT NULL,
+          id TEXT NOT NULL,
+          title TEXT NOT NULL,
+          due_date TEXT,
+          description TEXT,
+          url TEXT,
+          update_time TEXT,
+          PRIMARY KEY (user_id, course_id, id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS course_sync (
+          user_id TEXT NOT NULL,
+          course_id TEXT NOT NULL,
+          course_name TEXT NOT NULL,
+          position INTEGER NOT NULL,
+          cursor TEXT,
+          full_synced_at INTEGER,
+          PRIMARY KEY (user_id, course_id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS classroom_sync (
+          user_id TEXT PRIMARY KEY,
+          synced_at INTEGER NOT NULL
+        )
+        """
+    )
+    # Generated weekly plans, reused until the assignments they were built from change.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS weekly_plans (
+          user_id TEXT NOT NULL,
+          week_start TEXT NOT NULL,
+          plan_json TEXT NOT NULL,
+          fingerprint TEXT NOT NULL,
+          planner TEXT NOT NULL,
+          updated_at INTEGER NOT NULL,
+          PRIMARY KEY (user_id, week_start)
+        )
+        """
+    )
+    # OAuth state -> PKCE verifier when PKCE_STORE_BACKEND=sqlite (see app/services/pkce_store.py).
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pkce_states (
+          state TEXT PRIMARY KEY,
+          verifier TEXT NOT NULL,
+          expires_at REAL NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS pkce_states_expires_at ON pkce_states (expires_at)")
     conn.commit()
 
 
@@ -46,22 +159,46 @@ def upsert_tokens(
 ) -> None:
     conn = get_conn()
     with conn:
-        conn.execute(
-            """
-            INSERT INTO oauth_tokens (user_id, access_token, refresh_token, expires_at, token_type, scope, id_token)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET
-              access_token=excluded.access_token,
-              refresh_token=COALESCE(excluded.refresh_token, oauth_tokens.refresh_token),
-              expires_at=excluded.expires_at,
-              token_type=excluded.token_type,
-              scope=excluded.scope,
-              id_token=excluded.id_token
-            """,
-            (user_id, access_token, refresh_token, expires_at, token_type, scope, id_token),
+        write_tokens(
+            conn,
+            user_id=user_id,
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_at=expires_at,
+            token_type=token_type,
+            scope=scope,
+            id_token=id_token,
         )
 
 
+def write_tokens(
+    conn: sqlite3.Connection,
+    *,
+    user_id: str,
+    access_token: str,
+    refresh_token: Optional[str],
+    expires_at: Optional[int],
+    token_type: Optional[str],
+    scope: Optional[str],
+    id_token: Optional[str],
+) -> None:
+    # No commit here: callers own the transaction (see upsert_tokens / DBExecutor.write).
+    conn.execute(
+        """
+        INSERT INTO oauth_tokens (user_id, access_token, refresh_token, expires_at, token_type, scope, id_token)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+          access_token=excluded.access_token,
+          refresh_token=COALESCE(excluded.refresh_token, oauth_tokens.refresh_token),
+          expires_at=excluded.expires_at,
+          token_type=excluded.token_type,
+          scope=excluded.scope,
+          id_token=excluded.id_token
+        """,
+        (user_id, access_token, refresh_token, expires_at, token_type, scope, id_token),
+    )
+
+
 def get_tokens(user_id: str) -> Optional[dict]:
     conn = get_conn()
     row = conn.execute("SELECT * FROM oauth_tokens WHERE user_id=?", (user_id,)).fetchone()
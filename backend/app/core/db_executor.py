@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional, TypeVar
+
+from app.core.db import get_conn
+
+
+T = TypeVar("T")
+
+_STOP = object()
+
+
+class DBExecutor:
+    """
+    Keeps SQLite off the event loop.
+
+    Reads run on a small thread pool (each thread has its own connection; WAL lets them run
+    alongside the writer). Writes are queued to a single writer thread that commits whatever
+    has queued up in one grouped transaction, so a burst of writes costs one fsync.
+    """
+
+    def __init__(self, max_readers: int = 4, max_batch: int = 64) -> None:
+        self.max_readers = max_readers
+        self.max_batch = max_batch
+        self._readers: Optional[ThreadPoolExecutor] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    async def read(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader_pool(), partial(fn, *args))
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run `fn(conn)` on the writer thread; it must not commit (the batch does)."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._ensure_writer()
+        self._queue.put((fn, loop, fut))
+        return await fut
+
+    def close(self) -> None:
+        with self._lock:
+            writer, self._writer = self._writer, None
+            readers, self._readers = self._readers, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+        if readers is not None:
+            readers.shutdown(wait=True)
+
+    def _reader_pool(self) -> ThreadPoolExecutor:
+        pool = self._readers
+        if pool is None:
+            with self._lock:
+                if self._readers is None:
+                    self._readers = ThreadPoolExecutor(
+                        max_workers=self.max_readers, thread_name_prefix="db-read"
+                    )
+                pool = self._readers
+        return pool
+
+    def _ensure_writer(self) -> None:
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, name="db-write", daemon=True)
+                self._writer.start()
+
+    def _run_writer(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            try:
+                self._commit(batch)
+            except BaseException as e:
+                # Never let the writer thread die with callers still awaiting its batch.
+                for _, loop, fut in batch:
+                    _resolve(loop, fut, error=e)
+            if stop:
+                return
+
+    def _commit(self, batch: list) -> None:
+        try:
+            conn = get_conn()
+        except Exception as e:
+            # No connection (bad path, out of file descriptors): the whole batch fails.
+            for _, loop, fut in batch:
+                _resolve(loop, fut, error=e)
+            return
+        try:
+            with conn:
+                results = [fn(conn) for fn, _, _ in batch]
+        except Exception as e:
+            if len(batch) == 1:
+                _, loop, fut = batch[0]
+                _resolve(loop, fut, error=e)
+                return
+            # One bad write shouldn't fail the rest of its group: retry them one by one.
+            for item in batch:
+                self._commit([item])
+            return
+        for (_, loop, fut), result in zip(batch, results):
+            _resolve(loop, fut, result=result)
+
+
+def _resolve(
+    loop: asyncio.AbstractEventLoop,
+    fut: asyncio.Future,
+    *,
+    result: Any = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    def settle() -> None:
+        if fut.done():
+            return
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    try:
+        loop.call_soon_threadsafe(settle)
+    except RuntimeError:
+        # The caller's loop is gone (e.g. shutdown); the write is committed regardless.
+        pass
+
+
+db_executor = DBExecutor()
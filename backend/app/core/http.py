@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+
+import httpx
+
+from app.core.circuit import CircuitBreaker
+from app.core.config import get_settings
+from app.core.logging import log_event
+
+
+# One pooled client per upstream, created/closed by the app lifespan (see app.main).
+GOOGLE = "google"
+OPENAI = "openai"
+
+_clients: dict[str, httpx.AsyncClient] = {}
+# Caps on concurrent calls per upstream, so bulk work (a batch of plans) can't flood one API.
+# Only tasks that opted in with `cap_upstream_calls()` take a slot; interactive requests,
+# logins and token refreshes never queue behind a batch.
+_slots: dict[str, asyncio.Semaphore] = {}
+_capped: ContextVar[bool] = ContextVar("upstream_capped", default=False)
+# Process-wide, unlike the clients: outages outlive any one client.
+breakers: dict[str, CircuitBreaker] = {GOOGLE: CircuitBreaker(GOOGLE), OPENAI: CircuitBreaker(OPENAI)}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_client(**kwargs) -> httpx.AsyncClient:
+    # Extra kwargs are passed through to httpx (e.g. `verify=` for a local TLS stand-in).
+    settings = get_settings()
+    http2 = settings.http2_enabled
+    if http2 and not _http2_available():
+        # httpx needs the optional `h2` package (`pip install httpx[http2]`).
+        log_event("http_client", http2=False, fallback_reason="h2_missing")
+        http2 = False
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+    kwargs.setdefault("timeout", 10.0)
+    return httpx.AsyncClient(limits=limits, http2=http2, **kwargs)
+
+
+async def start_http_clients() -> None:
+    settings = get_settings()
+    caps = {GOOGLE: settings.google_max_concurrency, OPENAI: settings.openai_max_concurrency}
+    for name in (GOOGLE, OPENAI):
+        if name not in _clients:
+            _clients[name] = build_client()
+        if caps[name] > 0 and name not in _slots:
+            _slots[name] = asyncio.Semaphore(caps[name])
+
+
+async def close_http_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    _slots.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def cap_upstream_calls() -> None:
+    """Make upstream calls from the current task (and tasks it spawns) take a per-upstream slot."""
+    _capped.set(True)
+
+
+@asynccontextmanager
+async def upstream_client(name: str, *, capped: bool = True) -> AsyncIterator[httpx.AsyncClient]:
+    # While the upstream's circuit is open this raises CircuitOpenError (a ConnectionError)
+    # right away; whatever escapes the block is reported to the breaker. `capped=False` skips
+    # the per-upstream slot even in capped tasks (short calls that others wait on).
+    breaker = breakers[name]
+    breaker.before_call()
+    try:
+        async with _acquire(name, capped=capped and _capped.get()) as client:
+            yield client
+    except BaseException as e:
+        breaker.record(e)
+        raise
+    breaker.record(None)
+
+
+@asynccontextmanager
+async def _acquire(name: str, *, capped: bool) -> AsyncIterator[httpx.AsyncClient]:
+    client = _clients.get(name)
+    if client is not None:
+        slot = _slots.get(name) if capped else None
+        if slot is None:
+            yield client
+            return
+        async with slot:
+            yield client
+        return
+    # Outside the app lifespan (scripts, tests): use a short-lived client.
+    async with build_client() as client:
+        yield client
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import threading
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional, TextIO
+from uuid import uuid4
+
+from app.core.config import get_settings
+
+
+# Structured event logging. `log_event` only formats a record and puts it on a queue; a
+# listener thread does the (possibly slow) stdout writes, so a backed-up log collector never
+# blocks the event loop. Output is `event key=value ...` (the format of the old print lines)
+# or one JSON object per line with LOG_FORMAT=json.
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_logger = logging.getLogger("studybuddy")
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+_sample_rates: tuple[str, dict[str, float]] = ("", {})
+
+
+def log_event(event: str, **fields: Any) -> None:
+    """
+    Log one event. High-volume events can be sampled with LOG_SAMPLE_RATES
+    (e.g. "assignments_source=0.1"); anything with a fallback_reason other than "none" is
+    always kept.
+    """
+    rate = _sample_rate(event)
+    if rate < 1.0 and fields.get("fallback_reason", "none") == "none" and random.random() >= rate:
+        return
+    if _listener is None:
+        setup_logging()
+    request_id = request_id_var.get()
+    if request_id is not None:
+        fields["request_id"] = request_id
+    _logger.info(event, extra={"fields": fields})
+
+
+def setup_logging(stream: Optional[TextIO] = None) -> None:
+    """Start the queue listener (idempotent); `log_event` calls this on first use."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return
+        settings = get_settings()
+        stream = logging.StreamHandler(stream or sys.stdout)
+        stream.setFormatter(JSONFormatter() if settings.log_format == "json" else KeyValueFormatter())
+        # Unbounded: dropping or blocking on a full queue would be worse than memory growth
+        # during a short stall of the collector.
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _logger.handlers[:] = [QueueHandler(log_queue)]
+        _logger.setLevel(settings.log_level.upper())
+        _logger.propagate = False
+        _listener = QueueListener(log_queue, stream, respect_handler_level=False)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+atexit.register(shutdown_logging)
+
+
+class KeyValueFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", {})
+        parts = [record.getMessage()]
+        parts += [f"{k}={_kv_value(v)}" for k, v in fields.items()]
+        return " ".join(parts)
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        out = {"ts": round(record.created, 3), "level": record.levelname.lower(), "event": record.getMessage()}
+        out.update(getattr(record, "fields", {}))
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware: takes a sane incoming X-Request-ID or makes one, exposes it to log
+    events via `request_id_var` (tasks spawned by the request inherit it), and echoes it in
+    the response headers.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_id = _incoming_request_id(scope) or uuid4().hex[:16]
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (b"x-request-id", request_id.encode("ascii"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _incoming_request_id(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"x-request-id":
+            candidate = value.decode("latin-1")
+            return candidate if _REQUEST_ID_RE.match(candidate) else None
+    return None
+
+
+def _sample_rate(event: str) -> float:
+    global _sample_rates
+    raw = get_settings().log_sample_rates
+    if raw != _sample_rates[0]:
+        rates: dict[str, float] = {}
+        for part in raw.split(","):
+            name, sep, value = part.partition("=")
+            try:
+                if sep:
+                    rates[name.strip()] = min(1.0, max(0.0, float(value)))
+            except ValueError:
+                continue
+        _sample_rates = (raw, rates)
+    return _sample_rates[1].get(event, 1.0)
+
+
+def _kv_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "none"
+    text = str(value)
+    return json.dumps(text) if (" " in text or '"' in text or not text) else text
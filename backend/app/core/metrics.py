@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Iterator, Mapping, Optional
+
+
+# Minimal in-process metrics rendered in the Prometheus text format (served at /metrics).
+# Recording is a dict lookup plus a couple of additions; call it from the event loop thread.
+
+PREFIX = "studybuddy"
+
+# Upper bounds in seconds; covers cache hits (sub-ms) through slow LLM calls.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {_num(value)}")
+        return lines
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help: str, labelnames: tuple[str, ...], buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _num(bound)
+                lines.append(
+                    f"{self.name}_bucket{_labels((*self.labelnames, 'le'), (*labels, le))} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+stage_seconds = Histogram(
+    f"{PREFIX}_stage_duration_seconds",
+    "Time spent per request stage.",
+    ("stage", "outcome"),
+)
+fallbacks = Counter(
+    f"{PREFIX}_fallbacks_total",
+    "Fallbacks taken, by component and reason.",
+    ("component", "reason"),
+)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block into `stage_seconds`; outcome is "error" when it raises."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, name, outcome)
+
+
+def record_fallback(component: str, reason: str) -> None:
+    fallbacks.inc(component, reason)
+
+
+def render(stats: Optional[Mapping[str, Mapping[str, object]]] = None) -> str:
+    """Prometheus text exposition; `stats` adds `<prefix>_<group>_<key>` gauges (numbers only)."""
+    lines = stage_seconds.render() + fallbacks.render()
+    for group, values in (stats or {}).items():
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{PREFIX}_{group}_{key}"
+            lines += [f"# TYPE {name} gauge", f"{name} {_num(value)}"]
+    return "\n".join(lines) + "\n"
+
+
+def reset() -> None:
+    stage_seconds.clear()
+    fallbacks.clear()
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
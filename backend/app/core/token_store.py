@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.db import get_tokens, write_tokens
+from app.core.db_executor import db_executor
+
+
+class TokenCache:
+    """
+    Size-bounded LRU of `oauth_tokens` rows keyed by user_id.
+
+    Rows are cached as stored (including `expires_at`), so callers keep doing their own expiry
+    checks; refreshes write through via `TokenStore.upsert`.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._max_entries = max_entries
+        self._data: OrderedDict[str, dict] = OrderedDict()
+        # Bumped on every write so a slow DB read can't overwrite a newer cached row.
+        self.writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_entries(self) -> int:
+        if self._max_entries is not None:
+            return self._max_entries
+        return get_settings().token_cache_max_entries
+
+    def get(self, user_id: str) -> Optional[dict]:
+        row = self._data.get(user_id)
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(user_id)
+        return dict(row)
+
+    def fill(self, user_id: str, row: dict, *, writes_seen: int) -> None:
+        if writes_seen != self.writes:
+            return
+        self._set(user_id, row)
+
+    def write(self, user_id: str, row: dict) -> None:
+        self.writes += 1
+        if row.get("refresh_token") is None:
+            # The DB keeps the previous refresh token (COALESCE); mirror that if we have it.
+            cached = self._data.get(user_id)
+            if cached is None:
+                return
+            row = {**row, "refresh_token": cached.get("refresh_token")}
+        self._set(user_id, row)
+
+    def invalidate(self, user_id: str) -> None:
+        self.writes += 1
+        self._data.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.writes = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def _set(self, user_id: str, row: dict) -> None:
+        self._data[user_id] = dict(row)
+        self._data.move_to_end(user_id)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class TokenStore:
+    """Async access to `oauth_tokens` for request handlers; SQLite work runs off the event loop."""
+
+    def __init__(self) -> None:
+        self.cache = TokenCache()
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        row = self.cache.get(user_id)
+        if row is not None:
+            return row
+        writes_seen = self.cache.writes
+        row = await db_executor.read(get_tokens, user_id)
+        if row is not None:
+            self.cache.fill(user_id, row, writes_seen=writes_seen)
+        return row
+
+    async def upsert(
+        self,
+        *,
+        user_id: str,
+        access_token: str,
+        refresh_token: Optional[str],
+        expires_at: Optional[int],
+        token_type: Optional[str],
+        scope: Optional[str],
+        id_token: Optional[str],
+    ) -> None:
+        row = {
+            "user_id": user_id,
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_at": expires_at,
+            "token_type": token_type,
+            "scope": scope,
+            "id_token": id_token,
+        }
+        try:
+            await db_executor.write(lambda conn: write_tokens(conn, **row))
+        except BaseException:
+            # Unknown whether it committed; make the next read go to the database.
+            self.cache.invalidate(user_id)
+            raise
+        self.cache.write(user_id, row)
+
+
+token_store = TokenStore()
@@ -1,27 +1,59 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
+from app.core.db import close_all as close_db, init_db
+from app.core.db_executor import db_executor
+from app.core.http import close_http_clients, start_http_clients
+from app.core.logging import RequestIdMiddleware, setup_logging, shutdown_logging
 from app.routes.auth_google import router as auth_google_router
 from app.routes.chat import router as chat_router
 from app.routes.classroom import router as classroom_router
 from app.routes.health import router as health_router
+from app.routes.metrics import router as metrics_router
 from app.routes.plan import router as plan_router
+from app.services.token_refresher import token_refresher
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Log lines are written by a background thread so request handlers never block on stdout.
+    setup_logging()
+    # Schema setup runs once here rather than on every token read/write.
+    init_db()
+    # Shared, pooled upstream clients so requests reuse TCP/TLS connections.
+    await start_http_clients()
+    token_refresher.start()
+    try:
+        yield
+    finally:
+        await token_refresher.stop()
+        await close_http_clients()
+        # Flush queued token writes before closing connections.
+        db_executor.close()
+        close_db()
+        shutdown_logging()
 
 
 def create_app() -> FastAPI:
     settings = get_settings()
 
-    app = FastAPI(title="Study Buddy API")
+    app = FastAPI(title="Study Buddy API", lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins_list(),
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Request-ID"],
     )
+    # Added last so it wraps everything, including CORS responses.
+    app.add_middleware(RequestIdMiddleware)
 
     app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(chat_router)
     app.include_router(plan_router)
     app.include_router(auth_google_router)
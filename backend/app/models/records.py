@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+from app.models.schemas import Assignment
+
+
+@dataclass(frozen=True, slots=True)
+class AssignmentRecord:
+    """
+    Internal assignment used between Classroom/fixture loading and planning.
+
+    Same field names as the `Assignment` API model, so code that only reads attributes takes
+    either; `due_at` is `dueDate` parsed once up front (naive midnight for date-only values,
+    None when missing or malformed). Immutable, so caches can share instances. Convert with
+    `to_model()` only at the HTTP boundary.
+    """
+
+    id: str
+    title: str
+    dueDate: Optional[str]
+    courseName: str
+    description: Optional[str] = None
+    url: Optional[str] = None
+    estimatedMinutes: Optional[int] = None
+    due_at: Optional[datetime] = None
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        id: str,
+        title: str,
+        dueDate: Optional[str],
+        courseName: str,
+        description: Optional[str] = None,
+        url: Optional[str] = None,
+        estimatedMinutes: Optional[int] = None,
+        due_at: Optional[datetime] = None,
+    ) -> "AssignmentRecord":
+        # Pass `due_at` when the caller already has the parsed value (e.g. built dueDate from it).
+        return cls(
+            id=id,
+            title=title,
+            dueDate=dueDate,
+            courseName=sys.intern(courseName),
+            description=description,
+            url=url,
+            estimatedMinutes=estimatedMinutes,
+            due_at=due_at if due_at is not None else parse_due(dueDate),
+        )
+
+    @classmethod
+    def from_model(cls, a: Assignment) -> "AssignmentRecord":
+        return cls.create(
+            id=a.id,
+            title=a.title,
+            dueDate=a.dueDate,
+            courseName=a.courseName,
+            description=a.description,
+            url=a.url,
+            estimatedMinutes=a.estimatedMinutes,
+        )
+
+    def to_model(self) -> Assignment:
+        return Assignment(
+            id=self.id,
+            title=self.title,
+            dueDate=self.dueDate,
+            courseName=self.courseName,
+            description=self.description,
+            url=self.url,
+            estimatedMinutes=self.estimatedMinutes,
+        )
+
+
+def parse_due(due_iso: Optional[str]) -> Optional[datetime]:
+    # Accept ISO8601 datetime or date; anything else counts as no due date.
+    if not due_iso:
+        return None
+    try:
+        if "T" in due_iso:
+            return datetime.fromisoformat(due_iso.replace("Z", "+00:00"))
+        d = date.fromisoformat(due_iso)
+        return datetime(d.year, d.month, d.day)
+    except (TypeError, ValueError):
+        return None
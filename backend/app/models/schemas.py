@@ -42,6 +42,11 @@ class WeeklyPlan(BaseModel):
     items: List[PlanItem]
 
 
+class PlanBatchRequest(BaseModel):
+    user_ids: List[str] = Field(min_length=1)
+    refresh: bool = False
+
+
 class ChatSendRequest(BaseModel):
     user_message: str
     current_plan: Optional[WeeklyPlan] = None
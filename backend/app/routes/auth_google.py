@@ -8,12 +8,16 @@ from typing import Optional
 
 import httpx
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
 
 from app.core.auth import issue_session_token
 from app.core.config import get_settings
-from app.core.db import upsert_tokens
-from app.services.pkce_store import pkce_store
+from app.core.http import GOOGLE, upstream_client
+from app.core.logging import log_event
+from app.core.token_store import token_store
+from app.services.assignment_source import invalidate_assignments
+from app.services.pkce_store import get_pkce_store
 
 router = APIRouter()
 
@@ -44,7 +48,7 @@ def google_start() -> dict:
 
     state = _new_state()
     verifier = _new_verifier()
-    pkce_store.put(state, verifier)
+    get_pkce_store().put(state, verifier)
 
     params = {
         "client_id": settings.google_client_id,
@@ -74,7 +78,7 @@ def google_start() -> dict:
         authorization_url = authorization_url.copy_add_param(k, v)
 
     # Logging: high-level only, no secrets.
-    print("oauth_start used_classroom=true")
+    log_event("oauth_start", used_classroom=True)
     return {"authorization_url": str(authorization_url), "state": state}
 
 
@@ -86,7 +90,8 @@ async def google_callback(code: Optional[str] = None, state: Optional[str] = Non
     if not code or not state:
         raise HTTPException(status_code=400, detail="Missing code/state")
 
-    verifier = pkce_store.pop(state)
+    # The SQLite backend blocks, so keep it off the event loop.
+    verifier = await run_in_threadpool(get_pkce_store().pop, state)
     if not verifier:
         raise HTTPException(status_code=400, detail="Invalid state")
 
@@ -100,7 +105,7 @@ async def google_callback(code: Optional[str] = None, state: Optional[str] = Non
     if settings.google_client_secret:
         token_payload["client_secret"] = settings.google_client_secret
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with upstream_client(GOOGLE) as client:
         r = await client.post("https://oauth2.googleapis.com/token", data=token_payload)
         if r.status_code != 200:
             raise HTTPException(status_code=502, detail="Google token exchange failed")
@@ -119,7 +124,7 @@ async def google_callback(code: Optional[str] = None, state: Optional[str] = Non
         user_id = await _resolve_user_id(client, access_token, id_token=id_token)
 
     expires_at = int(time.time() + int(expires_in)) if expires_in else None
-    upsert_tokens(
+    await token_store.upsert(
         user_id=user_id,
         access_token=access_token,
         refresh_token=refresh_token,
@@ -128,6 +133,8 @@ async def google_callback(code: Optional[str] = None, state: Optional[str] = Non
         scope=scope,
         id_token=id_token,
     )
+    # New grant (possibly different scopes/account): don't serve assignments cached before it.
+    await invalidate_assignments(user_id)
 
     session_token = issue_session_token(user_id)
     # Redirect back to iOS deep link.
@@ -1,18 +1,23 @@
-from typing import Optional
+import json
+from typing import AsyncIterator, Optional, Tuple
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
+from app.models.records import AssignmentRecord
 from app.models.schemas import (
     ChatMessage,
     ChatSendRequest,
     ChatSendResponse,
+    PlanItem,
     iso_now,
     new_id,
 )
 from app.core.auth import get_optional_user_id
-from app.services.openai_client import coach_text
+from app.core.metrics import record_fallback, stage
+from app.services.openai_client import coach_text, coach_text_stream
 from app.services.planner import coach_message_for_action
-from app.services.planning import best_next_action_from_plan, generate_weekly_plan_with_fallback
+from app.services.planning import best_next_action_from_plan, generate_weekly_plan_with_assignments
 from app.services.assignment_source import select_assignments
 
 router = APIRouter()
@@ -25,10 +30,82 @@ async def chat_send(
     payload: ChatSendRequest, user_id: Optional[str] = Depends(get_optional_user_id)
 ) -> ChatSendResponse:
     # Must ALWAYS return assistant_message + exactly ONE best_next_action.
+    best_next_action, mins, assignment_description = await _prepare(payload, user_id)
+
+    # OpenAI (optional) for coaching text only, with deterministic fallback.
+    try:
+        user_msg = _coach_user_message(payload.user_message, assignment_description)
+        with stage("coach_text"):
+            text = await coach_text(user_msg, best_next_action.title, mins)
+        if best_next_action.title not in text:
+            text = f"{text}\n\nNext: {best_next_action.title}."
+    except Exception:
+        record_fallback("chat", "coach_failed")
+        text = _fallback_text(best_next_action, mins, assignment_description)
+
+    assistant_message = ChatMessage(id=new_id(), role="assistant", text=text, timestamp=iso_now())
+
+    return ChatSendResponse(
+        assistant_message=assistant_message,
+        best_next_action=best_next_action,
+    )
+
+
+@router.post("/chat/send/stream")
+async def chat_send_stream(
+    payload: ChatSendRequest, user_id: Optional[str] = Depends(get_optional_user_id)
+) -> StreamingResponse:
+    """
+    Server-Sent Events variant of /chat/send.
+
+    Events: `best_next_action` (PlanItem, sent first), then `delta` ({"text"}) chunks of coaching
+    text. If the stream fails, `fallback` ({"text"}) carries the deterministic text, which
+    replaces anything streamed so far. `done` ends the stream with the full ChatSendResponse.
+    """
+    best_next_action, mins, assignment_description = await _prepare(payload, user_id)
+
+    async def events() -> AsyncIterator[str]:
+        yield _sse("best_next_action", best_next_action.model_dump())
+        parts: list[str] = []
+        try:
+            user_msg = _coach_user_message(payload.user_message, assignment_description)
+            with stage("coach_text_stream"):
+                async for delta in coach_text_stream(user_msg, best_next_action.title, mins):
+                    parts.append(delta)
+                    yield _sse("delta", {"text": delta})
+            text = "".join(parts).strip()
+            if not text:
+                raise RuntimeError("OpenAI stream missing text")
+            if best_next_action.title not in text:
+                suffix = f"\n\nNext: {best_next_action.title}."
+                text = f"{text}{suffix}"
+                yield _sse("delta", {"text": suffix})
+        except Exception:
+            record_fallback("chat", "coach_failed")
+            text = _fallback_text(best_next_action, mins, assignment_description)
+            yield _sse("fallback", {"text": text})
+
+        assistant_message = ChatMessage(id=new_id(), role="assistant", text=text, timestamp=iso_now())
+        response = ChatSendResponse(assistant_message=assistant_message, best_next_action=best_next_action)
+        yield _sse("done", response.model_dump())
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _prepare(
+    payload: ChatSendRequest, user_id: Optional[str]
+) -> Tuple[PlanItem, int, Optional[str]]:
+    # Everything the reply needs before any coaching text: action, starter minutes, instructions.
+    assignments: Optional[list[AssignmentRecord]] = None
     if payload.current_plan and payload.current_plan.items:
         best_next_action = best_next_action_from_plan(payload.current_plan)
     else:
-        plan, _meta = await generate_weekly_plan_with_fallback(user_id=user_id)
+        # Keep the assignments planning already loaded so instructions need no second fetch.
+        plan, _meta, assignments = await generate_weekly_plan_with_assignments(user_id=user_id)
         best_next_action = best_next_action_from_plan(plan)
 
     mins = best_next_action.estimatedMinutes or 15
@@ -38,33 +115,29 @@ async def chat_send(
     if user_id and best_next_action.sourceAssignmentId:
         msg_lc = payload.user_message.lower()
         if any(k in msg_lc for k in _INSTRUCTION_KEYWORDS):
-            assignments, _meta = await select_assignments(user_id)
+            if assignments is None:
+                assignments, _meta = await select_assignments(user_id)
             match = next((a for a in assignments if a.id == best_next_action.sourceAssignmentId), None)
             if match and match.description:
                 assignment_description = match.description.strip()[:1200]
 
-    # OpenAI (optional) for coaching text only, with deterministic fallback.
-    try:
-        user_msg = payload.user_message
-        if assignment_description:
-            user_msg = f"{user_msg}\n\nAssignment instructions:\n{assignment_description}"
-        text = await coach_text(user_msg, best_next_action.title, mins)
-        if best_next_action.title not in text:
-            text = f"{text}\n\nNext: {best_next_action.title}."
-    except Exception:
-        if assignment_description:
-            text = (
-                f"Instructions:\n{assignment_description}\n\n"
-                f"Next: {best_next_action.title}. Set a {mins}-minute timer and start."
-            )
-        else:
-            text = coach_message_for_action(best_next_action)
+    return best_next_action, mins, assignment_description
 
-    assistant_message = ChatMessage(id=new_id(), role="assistant", text=text, timestamp=iso_now())
 
-    return ChatSendResponse(
-        assistant_message=assistant_message,
-        best_next_action=best_next_action,
-    )
+def _coach_user_message(user_message: str, assignment_description: Optional[str]) -> str:
+    if assignment_description:
+        return f"{user_message}\n\nAssignment instructions:\n{assignment_description}"
+    return user_message
+
+
+def _fallback_text(best_next_action: PlanItem, mins: int, assignment_description: Optional[str]) -> str:
+    if assignment_description:
+        return (
+            f"Instructions:\n{assignment_description}\n\n"
+            f"Next: {best_next_action.title}. Set a {mins}-minute timer and start."
+        )
+    return coach_message_for_action(best_next_action)
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -12,10 +12,12 @@ router = APIRouter()
 @router.get("/classroom/assignments", response_model=list[Assignment])
 async def classroom_assignments(ctx: AuthContext = Depends(require_user_id)) -> list[Assignment]:
     try:
-        return await fetch_classroom_assignments(ctx.user_id)
+        records = await fetch_classroom_assignments(ctx.user_id)
     except PermissionError:
         raise HTTPException(status_code=401, detail="Missing or invalid session token")
     except ConnectionError:
         raise HTTPException(status_code=502, detail="Google API unreachable")
+    # Internal records become API models only here, at the response boundary.
+    return [r.to_model() for r in records]
 
 
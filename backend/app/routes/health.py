@@ -1,10 +1,13 @@
 from fastapi import APIRouter
 
+from app.core.http import breakers
+
 router = APIRouter()
 
 
 @router.get("/health")
 def health() -> dict:
-    return {"status": "ok"}
+    # Open circuits don't make the API unhealthy (it falls back), so status stays "ok".
+    return {"status": "ok", "circuits": {name: b.snapshot() for name, b in breakers.items()}}
 
 
@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+from app.core.auth import session_cache
+from app.core.http import breakers
+from app.core.token_store import token_store
+from app.services.assignment_source import classroom_loads
+from app.services.llm_cache import llm_plan_cache
+from app.services.rate_limit import classroom_limiter
+from app.services.token_refresher import token_refresher
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    # Prometheus text format: stage latency histograms, fallback counters, and the existing
+    # cache/limiter/breaker stats as gauges. Async on purpose: the metrics are only safe to
+    # read from the event loop thread, and rendering is cheap.
+    stats = {
+        "token_cache": token_store.cache.stats(),
+        "session_cache": session_cache.stats(),
+        "llm_cache": llm_plan_cache.stats(),
+        "classroom_loads": classroom_loads.stats(),
+        "token_refresher": token_refresher.stats(),
+        "classroom_limiter": classroom_limiter.stats(),
+    }
+    for name, breaker in breakers.items():
+        snapshot = breaker.snapshot()
+        stats[f"circuit_{name}"] = {**snapshot, "open": int(snapshot["state"] != "closed")}
+    return PlainTextResponse(metrics.render(stats), media_type="text/plain; version=0.0.4")
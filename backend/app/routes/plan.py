@@ -1,18 +1,43 @@
-from typing import Optional
+import json
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.models.schemas import WeeklyPlan
-from app.core.auth import get_optional_user_id
+from app.models.schemas import PlanBatchRequest, WeeklyPlan
+from app.core.auth import get_optional_user_id, require_admin
+from app.core.config import get_settings
+from app.services.plan_batch import iter_batch_plans
 from app.services.planning import generate_weekly_plan_with_fallback
 
 router = APIRouter()
 
 
 @router.get("/plan/week", response_model=WeeklyPlan)
-async def get_week_plan(user_id: Optional[str] = Depends(get_optional_user_id)) -> WeeklyPlan:
+async def get_week_plan(
+    refresh: bool = False, user_id: Optional[str] = Depends(get_optional_user_id)
+) -> WeeklyPlan:
     # Must always succeed: fallback chain inside.
-    plan, _meta = await generate_weekly_plan_with_fallback(user_id=user_id)
+    # Signed-in users get their stored plan for the week unless `refresh=true`.
+    plan, _meta = await generate_weekly_plan_with_fallback(user_id=user_id, refresh=refresh)
     return plan
 
 
+@router.post("/plan/batch", dependencies=[Depends(require_admin)])
+async def plan_batch(payload: PlanBatchRequest) -> StreamingResponse:
+    """
+    Weekly plans for many users (e.g. a homeroom), for the counselor dashboard.
+
+    Requires the `X-Admin-Key` header. Streams NDJSON: one line per user as soon as that plan
+    is ready, `{"user_id", "ok": true, "planner", "plan_source", "used_classroom", "ms", "plan"}`
+    or `{"user_id", "ok": false, "error"}`.
+    """
+    max_users = get_settings().plan_batch_max_users
+    if len(payload.user_ids) > max_users:
+        raise HTTPException(status_code=422, detail=f"At most {max_users} user_ids per batch")
+
+    async def lines() -> AsyncIterator[str]:
+        async for result in iter_batch_plans(payload.user_ids, refresh=payload.refresh):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Literal, Optional, Tuple
+
+from app.core.config import get_settings
+from app.models.records import AssignmentRecord
+
+
+CacheState = Literal["hit", "stale", "miss"]
+
+
+class AssignmentCache:
+    """
+    Per-user Classroom assignments with a TTL and a stale-while-revalidate window.
+
+    Entries younger than the TTL are "hit"; older ones are still served as "stale" (the caller
+    refreshes in the background) until `max_stale_seconds`, after which they count as a miss.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        max_stale_seconds: Optional[float] = None,
+        max_entries: int = 1024,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_stale_seconds = max_stale_seconds
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[list[AssignmentRecord], float]] = OrderedDict()
+        # Bumped on invalidation so an in-flight refresh can't resurrect old data.
+        self._generations: dict[str, int] = {}
+
+    @property
+    def ttl_seconds(self) -> float:
+        if self._ttl_seconds is not None:
+            return self._ttl_seconds
+        return get_settings().assignment_cache_ttl_seconds
+
+    @property
+    def max_stale_seconds(self) -> float:
+        if self._max_stale_seconds is not None:
+            return self._max_stale_seconds
+        return get_settings().assignment_cache_max_stale_seconds
+
+    def get(self, user_id: str) -> Tuple[Optional[list[AssignmentRecord]], CacheState]:
+        item = self._data.get(user_id)
+        if not item:
+            return None, "miss"
+        assignments, stored_at = item
+        age = time.monotonic() - stored_at
+        if age > self.max_stale_seconds:
+            self._data.pop(user_id, None)
+            return None, "miss"
+        self._data.move_to_end(user_id)
+        return list(assignments), "hit" if age <= self.ttl_seconds else "stale"
+
+    def generation(self, user_id: str) -> int:
+        return self._generations.get(user_id, 0)
+
+    def put(self, user_id: str, assignments: list[AssignmentRecord], *, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation(user_id):
+            return
+        self._data[user_id] = (list(assignments), time.monotonic())
+        self._data.move_to_end(user_id)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._data.pop(user_id, None)
+        self._generations[user_id] = self.generation(user_id) + 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._generations.clear()
+
+
+assignment_cache = AssignmentCache()
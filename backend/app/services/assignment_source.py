@@ -1,42 +1,135 @@
 from __future__ import annotations
 
+import asyncio
 import json
 from pathlib import Path
 from typing import Optional, Tuple
 
+from app.core.db_executor import db_executor
+from app.core.logging import log_event
+from app.core.metrics import record_fallback
+from app.models.records import AssignmentRecord
 from app.models.schemas import Assignment
+from app.services.assignment_cache import assignment_cache
 from app.services.classroom import fetch_classroom_assignments
+from app.services.coursework_store import write_sync_expired
 from app.services.planner import stub_assignments
+from app.services.singleflight import SingleFlight
 
 
 FIXTURE_PATH = Path(__file__).resolve().parents[1] / "fixtures" / "assignments.json"
 
+# Concurrent loads for the same user (e.g. /plan/week + /chat/send on app open) share one fetch.
+classroom_loads = SingleFlight()
 
-async def select_assignments(user_id: Optional[str]) -> Tuple[list[Assignment], dict]:
+# Parsed fixture per path, keyed by the file's (mtime_ns, size) so edits on disk are picked up.
+_fixture_cache: dict[Path, tuple[tuple[int, int], list[AssignmentRecord]]] = {}
+
+
+async def select_assignments(user_id: Optional[str]) -> Tuple[list[AssignmentRecord], dict]:
     # Explicit fallback chain:
     # 1) Authenticated + classroom succeeds
     # 2) Local fixture exists
     # 3) Hardcoded stub list (3)
     if user_id:
+        cached, cache_state = assignment_cache.get(user_id)
+        if cached is not None:
+            if cache_state == "stale":
+                _schedule_refresh(user_id)
+            log_event(
+                "assignments_source",
+                used_classroom=True,
+                used_fixture=False,
+                fallback_reason="none",
+                cache=cache_state,
+            )
+            return cached, {"used_classroom": True, "used_fixture": False, "cache": cache_state}
         try:
-            assignments = await fetch_classroom_assignments(user_id)
-            if not assignments:
-                raise RuntimeError("classroom_empty")
-            print("assignments_source used_classroom=true used_fixture=false fallback_reason=none")
-            return assignments, {"used_classroom": True, "used_fixture": False}
+            assignments = await _load_classroom(user_id)
+            log_event(
+                "assignments_source", used_classroom=True, used_fixture=False, fallback_reason="none", cache="miss"
+            )
+            return assignments, {"used_classroom": True, "used_fixture": False, "cache": "miss"}
         except Exception:
-            print("assignments_source used_classroom=false used_fixture=false fallback_reason=classroom_failed")
+            log_event(
+                "assignments_source", used_classroom=False, used_fixture=False, fallback_reason="classroom_failed"
+            )
+            record_fallback("assignments", "classroom_failed")
+
+    try:
+        assignments = _load_fixture()
+    except Exception:
+        assignments = None
+        log_event("assignments_source", used_classroom=False, used_fixture=False, fallback_reason="fixture_invalid")
+        record_fallback("assignments", "fixture_invalid")
+    if assignments is not None:
+        log_event("assignments_source", used_classroom=False, used_fixture=True, fallback_reason="none")
+        return assignments, {"used_classroom": False, "used_fixture": True, "cache": "none"}
+
+    log_event("assignments_source", used_classroom=False, used_fixture=False, fallback_reason="using_stub")
+    record_fallback("assignments", "using_stub")
+    stub = [AssignmentRecord.from_model(a) for a in stub_assignments()]
+    return stub, {"used_classroom": False, "used_fixture": False, "cache": "none"}
+
+
+async def invalidate_assignments(user_id: str) -> None:
+    # Call when a user's Classroom data is known to have changed (e.g. after OAuth): drops the
+    # cached list and makes the SQLite mirror sync with Google on the next load.
+    assignment_cache.invalidate(user_id)
+    await db_executor.write(lambda conn: write_sync_expired(conn, user_id))
+
+
+def _load_fixture() -> Optional[list[AssignmentRecord]]:
+    # None when there is no fixture; raises when it exists but doesn't parse.
+    try:
+        st = FIXTURE_PATH.stat()
+    except OSError:
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _fixture_cache.get(FIXTURE_PATH)
+    if cached is None or cached[0] != version:
+        raw = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
+        records = [AssignmentRecord.from_model(Assignment.model_validate(a)) for a in raw]
+        cached = _fixture_cache[FIXTURE_PATH] = (version, records)
+    return list(cached[1])
+
+
+async def _load_classroom(user_id: str) -> list[AssignmentRecord]:
+    return await classroom_loads.do(user_id, lambda: _fetch_and_cache(user_id))
+
+
+async def _fetch_and_cache(user_id: str) -> list[AssignmentRecord]:
+    generation = assignment_cache.generation(user_id)
+    assignments = await fetch_classroom_assignments(user_id)
+    if not assignments:
+        raise RuntimeError("classroom_empty")
+    assignment_cache.put(user_id, assignments, generation=generation)
+    return assignments
+
+
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+
+def _schedule_refresh(user_id: str) -> None:
+    running = _refresh_tasks.get(user_id)
+    if running is not None and not running.done():
+        return
+    task = asyncio.create_task(_refresh(user_id))
+    _refresh_tasks[user_id] = task
+
+    def forget(t: asyncio.Task) -> None:
+        if _refresh_tasks.get(user_id) is t:
+            del _refresh_tasks[user_id]
+
+    task.add_done_callback(forget)
 
-    if FIXTURE_PATH.exists():
-        try:
-            raw = json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
-            assignments = [Assignment.model_validate(a) for a in raw]
-            print("assignments_source used_classroom=false used_fixture=true fallback_reason=none")
-            return assignments, {"used_classroom": False, "used_fixture": True}
-        except Exception:
-            print("assignments_source used_classroom=false used_fixture=false fallback_reason=fixture_invalid")
 
-    print("assignments_source used_classroom=false used_fixture=false fallback_reason=using_stub")
-    return stub_assignments(), {"used_classroom": False, "used_fixture": False}
+async def _refresh(user_id: str) -> None:
+    try:
+        await _load_classroom(user_id)
+        log_event("assignments_refresh", used_classroom=True, fallback_reason="none")
+    except Exception:
+        # Keep serving the stale entry; the next stale read retries.
+        log_event("assignments_refresh", used_classroom=False, fallback_reason="classroom_failed")
 
 
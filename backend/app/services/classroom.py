@@ -1,21 +1,75 @@
 from __future__ import annotations
 
+import asyncio
+import random
 import time
 from datetime import datetime, timezone
-from typing import Optional
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Optional
 
 import httpx
 
 from app.core.config import get_settings
-from app.core.db import get_tokens, upsert_tokens
-from app.models.schemas import Assignment
+from app.core.db_executor import db_executor
+from app.core.http import GOOGLE, upstream_client
+from app.core.logging import log_event
+from app.core.metrics import record_fallback, stage
+from app.core.token_store import token_store
+from app.models.records import AssignmentRecord
+from app.services.coursework_store import (
+    CourseChanges,
+    CourseCursor,
+    read_assignments,
+    read_cursors,
+    read_synced_at,
+    write_course_changes,
+    write_course_list,
+)
+from app.services.rate_limit import classroom_limiter
+from app.services.token_refresher import token_refresher
 
 
 GOOGLE_API_BASE = "https://classroom.googleapis.com/v1"
 
 
-async def fetch_classroom_assignments(user_id: str) -> list[Assignment]:
-    tok = get_tokens(user_id)
+async def fetch_classroom_assignments(user_id: str) -> list[AssignmentRecord]:
+    # Served from the local mirror; Google is only asked for what changed since the last sync.
+    synced_at = await db_executor.read(read_synced_at, user_id)
+    max_age = get_settings().classroom_sync_max_age_seconds
+    if synced_at is None or time.time() - synced_at >= max_age:
+        try:
+            await sync_classroom(user_id)
+        except ConnectionError:
+            if synced_at is None:
+                raise
+            # Google is failing but we have an earlier copy; better than the fixture.
+            log_event("classroom_sync", ok=False, used_classroom=True, fallback_reason="serving_store")
+            record_fallback("classroom", "serving_store")
+    return await db_executor.read(read_assignments, user_id)
+
+
+async def sync_classroom(user_id: str) -> None:
+    """Pull changed courseWork for every active course into the local store."""
+    access_token = await _valid_access_token(user_id)
+
+    try:
+        async with upstream_client(GOOGLE) as client:
+            with stage("course_list"):
+                courses = await _list_courses(client, access_token, user_id=user_id)
+            await _sync_all_courses(client, access_token, user_id, courses)
+    except httpx.RequestError:
+        raise ConnectionError("google_unreachable")
+    except asyncio.TimeoutError:
+        raise ConnectionError("google_timeout")
+    except httpx.HTTPStatusError:
+        # Any other unexpected Google HTTP error should not crash the API.
+        raise ConnectionError("google_http_error")
+
+
+async def _valid_access_token(user_id: str) -> str:
+    token_refresher.mark_active(user_id)
+    with stage("token_lookup"):
+        tok = await token_store.get(user_id)
     if not tok:
         raise PermissionError("no_tokens")
 
@@ -26,127 +80,250 @@ async def fetch_classroom_assignments(user_id: str) -> list[Assignment]:
     if not access_token:
         raise PermissionError("no_access_token")
 
-    # Refresh if expired or near-expired.
+    # Refresh if expired or near-expired (normally the background refresher got there first).
     if expires_at and int(expires_at) <= int(time.time()) + 60:
         if not refresh_token:
             raise PermissionError("no_refresh_token")
-        access_token = await _refresh_access_token(user_id, refresh_token)
+        access_token = await token_refresher.ensure_fresh(user_id, min_valid_seconds=60)
+    return access_token
+
+
+async def _list_courses(
+    client: httpx.AsyncClient, access_token: str, *, user_id: Optional[str] = None
+) -> list[dict]:
+    return [c async for c in _iter_courses(client, access_token, user_id=user_id)]
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            courses = await _list_courses(client, access_token)
-            out: list[Assignment] = []
-            for c in courses:
-                course_id = c.get("id")
-                course_name = c.get("name") or "Course"
-                if not course_id:
-                    continue
-                course_work = await _list_coursework(client, access_token, course_id)
-                out.extend(_normalize_coursework(course_work, course_name))
-            return out
-    except httpx.RequestError:
-        raise ConnectionError("google_unreachable")
-    except httpx.HTTPStatusError:
-        # Any other unexpected Google HTTP error should not crash the API.
-        raise ConnectionError("google_http_error")
 
+async def _iter_courses(
+    client: httpx.AsyncClient, access_token: str, *, user_id: Optional[str] = None
+) -> AsyncIterator[dict]:
+    params = {"courseStates": "ACTIVE"}
+    while True:
+        r = await _google_get(client, f"{GOOGLE_API_BASE}/courses", access_token, params, user_id=user_id)
+        if r.status_code in (401, 403):
+            # Upstream auth/scopes/api access issues -> treat as upstream failure (502).
+            raise ConnectionError(f"google_forbidden_{r.status_code}")
+        r.raise_for_status()
+        data = r.json()
+        for c in data.get("courses", []) or []:
+            yield c
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            return
+        params = {"courseStates": "ACTIVE", "pageToken": page_token}
 
-async def _refresh_access_token(user_id: str, refresh_token: str) -> str:
+
+async def _sync_all_courses(
+    client: httpx.AsyncClient, access_token: str, user_id: str, courses: list[dict]
+) -> None:
+    # Sync courses concurrently (bounded); each course's changes commit as soon as it finishes.
     settings = get_settings()
-    if not settings.google_client_id:
-        raise PermissionError("oauth_not_configured")
-
-    payload = {
-        "client_id": settings.google_client_id,
-        "grant_type": "refresh_token",
-        "refresh_token": refresh_token,
-    }
-    if settings.google_client_secret:
-        payload["client_secret"] = settings.google_client_secret
-
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        r = await client.post("https://oauth2.googleapis.com/token", data=payload)
-        if r.status_code != 200:
-            raise PermissionError("refresh_failed")
-        tok = r.json()
-        access_token = tok.get("access_token")
-        expires_in = tok.get("expires_in")
-        token_type = tok.get("token_type")
-        scope = tok.get("scope")
-        if not access_token:
-            raise PermissionError("refresh_failed")
-
-    expires_at = int(time.time() + int(expires_in)) if expires_in else None
-    upsert_tokens(
-        user_id=user_id,
-        access_token=access_token,
-        refresh_token=None,  # keep existing
-        expires_at=expires_at,
-        token_type=token_type,
-        scope=scope,
-        id_token=None,
+    semaphore = asyncio.Semaphore(max(1, settings.classroom_max_concurrency))
+    timeout = settings.classroom_course_timeout_seconds
+    cursors = await db_executor.read(read_cursors, user_id)
+    now = int(time.time())
+    busy_seconds: list[float] = []
+    changed: list[int] = []
+    timed_out: list[str] = []
+
+    async def one(position: int, course_id: str, course_name: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                with stage("coursework"):
+                    changes = await asyncio.wait_for(
+                        _course_changes(
+                            client,
+                            access_token,
+                            CourseChanges(course_id, course_name, position, items=[], cursor=None, full=True),
+                            cursors.get(course_id),
+                            now,
+                            user_id=user_id,
+                        ),
+                        timeout=timeout,
+                    )
+            except asyncio.TimeoutError:
+                # A slow course should not hold up the rest; keep its stored copy for now.
+                log_event("classroom_coursework_timeout", used_classroom=True)
+                record_fallback("classroom", "course_timeout")
+                timed_out.append(course_id)
+                return
+            finally:
+                busy_seconds.append(time.perf_counter() - started)
+        changed.append(len(changes.items))
+        await db_executor.write(lambda conn: write_course_changes(conn, user_id, changes, now))
+
+    targets = [(str(c["id"]), c.get("name") or "Course") for c in courses if c.get("id")]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.ensure_future(one(position, course_id, name))
+        for position, (course_id, name) in enumerate(targets)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # On the first hard failure (e.g. 401), don't leave sibling requests running.
+        for t in tasks:
+            t.cancel()
+    if targets and len(timed_out) == len(targets):
+        # Every course hanging is Google trouble, not a slow class: fail the sync (the stored
+        # copy is served) and let the circuit breaker count it.
+        raise asyncio.TimeoutError("classroom_courses_timeout")
+    await db_executor.write(lambda conn: write_course_list(conn, user_id, targets, now))
+
+    wall_ms = (time.perf_counter() - started) * 1000
+    sequential_ms = sum(busy_seconds) * 1000
+    log_event(
+        "classroom_fanout",
+        courses=len(targets),
+        concurrency=settings.classroom_max_concurrency,
+        changed_items=sum(changed),
+        wall_ms=round(wall_ms),
+        sequential_ms=round(sequential_ms),
+        saved_ms=round(max(0.0, sequential_ms - wall_ms)),
     )
-    return access_token
 
 
-async def _list_courses(client: httpx.AsyncClient, access_token: str) -> list[dict]:
-    r = await client.get(
-        f"{GOOGLE_API_BASE}/courses",
-        headers={"Authorization": f"Bearer {access_token}"},
-        params={"courseStates": "ACTIVE"},
+async def _course_changes(
+    client: httpx.AsyncClient,
+    access_token: str,
+    changes: CourseChanges,
+    cursor: Optional[CourseCursor],
+    now: int,
+    *,
+    user_id: Optional[str] = None,
+) -> CourseChanges:
+    # Newest-updated first, so an incremental pass stops at the first item it already has.
+    changes.full = (
+        cursor is None
+        or cursor.update_time is None
+        or cursor.full_synced_at is None
+        or now - cursor.full_synced_at >= get_settings().classroom_full_sync_interval_seconds
     )
-    if r.status_code in (401, 403):
-        # Upstream auth/scopes/api access issues -> treat as upstream failure (502).
-        raise ConnectionError(f"google_forbidden_{r.status_code}")
-    r.raise_for_status()
-    data = r.json()
-    return data.get("courses", []) or []
-
-
-async def _list_coursework(client: httpx.AsyncClient, access_token: str, course_id: str) -> list[dict]:
-    r = await client.get(
-        f"{GOOGLE_API_BASE}/courses/{course_id}/courseWork",
-        headers={"Authorization": f"Bearer {access_token}"},
-        params={"orderBy": "dueDate desc"},
+    known = None if changes.full or cursor is None else _parse_rfc3339(cursor.update_time)
+    newest = None if cursor is None else cursor.update_time
+    pages = _iter_coursework_pages(
+        client, access_token, changes.course_id, order_by="updateTime desc", user_id=user_id
     )
-    if r.status_code == 401:
-        raise ConnectionError("google_unauthorized")
-    if r.status_code == 403:
-        # Some courses may be inaccessible for coursework; skip rather than failing everything.
-        print("classroom_coursework_forbidden used_classroom=true")
-        return []
-    # Some classes may have no coursework; Google returns 404 sometimes.
-    if r.status_code == 404:
-        return []
-    r.raise_for_status()
-    data = r.json()
-    return data.get("courseWork", []) or []
-
-
-def _normalize_coursework(coursework: list[dict], course_name: str) -> list[Assignment]:
-    out: list[Assignment] = []
+
+    async for page in pages:
+        reached_known = False
+        for w, a in zip(page, _normalize_coursework(page, changes.course_name)):
+            updated = w.get("updateTime") if isinstance(w.get("updateTime"), str) else None
+            if known is not None and updated and _parse_rfc3339(updated) <= known:
+                reached_known = True
+                break
+            changes.items.append((a, updated))
+            if updated and (newest is None or _parse_rfc3339(updated) > _parse_rfc3339(newest)):
+                newest = updated
+        if reached_known:
+            break
+
+    changes.cursor = newest
+    return changes
+
+
+async def _iter_coursework_pages(
+    client: httpx.AsyncClient,
+    access_token: str,
+    course_id: str,
+    *,
+    order_by: str = "dueDate desc",
+    user_id: Optional[str] = None,
+) -> AsyncIterator[list[dict]]:
+    params = {"orderBy": order_by}
+    while True:
+        url = f"{GOOGLE_API_BASE}/courses/{course_id}/courseWork"
+        r = await _google_get(client, url, access_token, params, user_id=user_id)
+        if r.status_code == 401:
+            raise ConnectionError("google_unauthorized")
+        if r.status_code == 403:
+            # Some courses may be inaccessible for coursework; skip rather than failing everything.
+            log_event("classroom_coursework_forbidden", used_classroom=True)
+            return
+        # Some classes may have no coursework; Google returns 404 sometimes.
+        if r.status_code == 404:
+            return
+        r.raise_for_status()
+        data = r.json()
+        yield data.get("courseWork", []) or []
+        page_token = data.get("nextPageToken")
+        if not page_token:
+            return
+        params = {"orderBy": order_by, "pageToken": page_token}
+
+
+_RETRY_STATUSES = (429, 503)
+
+
+async def _google_get(
+    client: httpx.AsyncClient,
+    url: str,
+    access_token: str,
+    params: dict,
+    *,
+    user_id: Optional[str] = None,
+) -> httpx.Response:
+    # Rate-limited GET; 429/503 are retried with backoff (honouring Retry-After) a few times
+    # before the response is handed back for the caller's usual error handling.
+    settings = get_settings()
+    attempt = 0
+    while True:
+        await classroom_limiter.acquire(user_id or access_token)
+        r = await client.get(url, headers={"Authorization": f"Bearer {access_token}"}, params=params)
+        if r.status_code not in _RETRY_STATUSES or attempt >= settings.classroom_retry_attempts:
+            return r
+        delay = _retry_delay(r.headers.get("Retry-After"), attempt)
+        if delay > settings.classroom_max_wait_seconds:
+            return r
+        classroom_limiter.retries += 1
+        log_event("classroom_retry", status=r.status_code, attempt=attempt + 1, delay_ms=round(delay * 1000))
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    # Retry-After is either delta-seconds or an HTTP date; otherwise exponential backoff with
+    # full jitter, so throttled workers don't retry in lockstep.
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    settings = get_settings()
+    cap = min(settings.classroom_retry_max_seconds, settings.classroom_retry_base_seconds * 2**attempt)
+    return random.uniform(0, cap)
+
+
+def _normalize_coursework(coursework: list[dict], course_name: str) -> list[AssignmentRecord]:
+    out: list[AssignmentRecord] = []
     for w in coursework:
         wid = w.get("id") or ""
         title = w.get("title") or "Assignment"
-        due_iso = _due_iso(w.get("dueDate"), w.get("dueTime"))
+        due_at = _due_at(w.get("dueDate"), w.get("dueTime"))
         desc = w.get("description")
         url = w.get("alternateLink")
         # Classroom doesn't provide estimated duration; leave None.
         out.append(
-            Assignment(
+            AssignmentRecord.create(
                 id=str(wid),
                 title=str(title),
-                dueDate=due_iso,
+                dueDate=due_at.isoformat() if due_at else None,
                 courseName=course_name,
                 description=str(desc) if isinstance(desc, str) else None,
                 url=str(url) if isinstance(url, str) else None,
                 estimatedMinutes=None,
+                due_at=due_at,
             )
         )
     return out
 
 
-def _due_iso(due_date: Optional[dict], due_time: Optional[dict]) -> Optional[str]:
+def _due_at(due_date: Optional[dict], due_time: Optional[dict]) -> Optional[datetime]:
     if not isinstance(due_date, dict):
         return None
     y = due_date.get("year")
@@ -159,7 +336,9 @@ def _due_iso(due_date: Optional[dict], due_time: Optional[dict]) -> Optional[str
     if isinstance(due_time, dict):
         hh = int(due_time.get("hours") or 0)
         mm = int(due_time.get("minutes") or 0)
-    dt = datetime(y, m, d, hh, mm, tzinfo=timezone.utc)
-    return dt.isoformat()
+    return datetime(y, m, d, hh, mm, tzinfo=timezone.utc)
 
 
+def _parse_rfc3339(value: str) -> datetime:
+    # Google timestamps vary in fractional digits, so compare parsed values, not strings.
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
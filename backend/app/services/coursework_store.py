@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.db import get_conn
+from app.models.records import AssignmentRecord
+
+
+# SQLite mirror of each user's Classroom coursework. Plain sync functions: run them through
+# `db_executor` (reads) or pass the `write_*` ones to `db_executor.write` (no commits here).
+
+
+@dataclass(frozen=True)
+class CourseCursor:
+    update_time: Optional[str]  # newest courseWork updateTime stored for the course
+    full_synced_at: Optional[int]
+
+
+@dataclass
+class CourseChanges:
+    course_id: str
+    course_name: str
+    position: int
+    items: list[tuple[AssignmentRecord, Optional[str]]]  # (assignment, updateTime)
+    cursor: Optional[str]
+    full: bool
+
+
+def read_synced_at(user_id: str) -> Optional[int]:
+    row = get_conn().execute("SELECT synced_at FROM classroom_sync WHERE user_id=?", (user_id,)).fetchone()
+    return row["synced_at"] if row else None
+
+
+def read_cursors(user_id: str) -> dict[str, CourseCursor]:
+    rows = get_conn().execute(
+        "SELECT course_id, cursor, full_synced_at FROM course_sync WHERE user_id=?", (user_id,)
+    )
+    return {r["course_id"]: CourseCursor(r["cursor"], r["full_synced_at"]) for r in rows}
+
+
+def read_assignments(user_id: str) -> list[AssignmentRecord]:
+    rows = get_conn().execute(
+        """
+        SELECT cw.id, cw.title, cw.due_date, cw.description, cw.url, cs.course_name
+        FROM coursework cw
+        JOIN course_sync cs ON cs.user_id = cw.user_id AND cs.course_id = cw.course_id
+        WHERE cw.user_id = ?
+        ORDER BY cs.position, cw.due_date DESC, cw.id
+        """,
+        (user_id,),
+    )
+    return [
+        AssignmentRecord.create(
+            id=r["id"],
+            title=r["title"],
+            dueDate=r["due_date"],
+            courseName=r["course_name"],
+            description=r["description"],
+            url=r["url"],
+            estimatedMinutes=None,
+        )
+        for r in rows
+    ]
+
+
+def write_course_changes(conn: sqlite3.Connection, user_id: str, changes: CourseChanges, now: int) -> None:
+    if changes.full:
+        # A full pass is the only way to notice deleted coursework.
+        conn.execute(
+            "DELETE FROM coursework WHERE user_id=? AND course_id=?", (user_id, changes.course_id)
+        )
+    conn.executemany(
+        """
+        INSERT INTO coursework (user_id, course_id, id, title, due_date, description, url, update_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, course_id, id) DO UPDATE SET
+          title=excluded.title,
+          due_date=excluded.due_date,
+          description=excluded.description,
+          url=excluded.url,
+          update_time=excluded.update_time
+        """,
+        [
+            (user_id, changes.course_id, a.id, a.title, a.dueDate, a.description, a.url, updated)
+            for a, updated in changes.items
+        ],
+    )
+    conn.execute(
+        """
+        INSERT INTO course_sync (user_id, course_id, course_name, position, cursor, full_synced_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, course_id) DO UPDATE SET
+          course_name=excluded.course_name,
+          position=excluded.position,
+          cursor=excluded.cursor,
+          full_synced_at=COALESCE(excluded.full_synced_at, course_sync.full_synced_at)
+        """,
+        (
+            user_id,
+            changes.course_id,
+            changes.course_name,
+            changes.position,
+            changes.cursor,
+            now if changes.full else None,
+        ),
+    )
+
+
+def write_course_list(
+    conn: sqlite3.Connection, user_id: str, courses: list[tuple[str, str]], now: int
+) -> None:
+    # `courses` is the current active (course_id, name) list in display order.
+    ids = [course_id for course_id, _ in courses]
+    placeholders = ",".join("?" for _ in ids)
+    for table in ("coursework", "course_sync"):
+        conn.execute(
+            f"DELETE FROM {table} WHERE user_id=? AND course_id NOT IN ({placeholders})",
+            (user_id, *ids),
+        )
+    conn.executemany(
+        """
+        INSERT INTO course_sync (user_id, course_id, course_name, position)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id, course_id) DO UPDATE SET
+          course_name=excluded.course_name,
+          position=excluded.position
+        """,
+        [(user_id, course_id, name, position) for position, (course_id, name) in enumerate(courses)],
+    )
+    conn.execute(
+        """
+        INSERT INTO classroom_sync (user_id, synced_at) VALUES (?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET synced_at=excluded.synced_at
+        """,
+        (user_id, now),
+    )
+
+
+def write_sync_expired(conn: sqlite3.Connection, user_id: str) -> None:
+    # Keeps the stored copy (still served if Google fails) but makes the next load sync.
+    conn.execute("UPDATE classroom_sync SET synced_at=0 WHERE user_id=?", (user_id,))
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import log_event
+
+
+class LLMPlanCache:
+    """
+    Content-addressed cache of raw LLM weekly-plan responses.
+
+    Keyed by a hash of the model name and the exact prompt, so identical inputs skip the
+    OpenAI round trip. In-memory LRU with a TTL, plus an optional on-disk tier
+    (`llm_cache_dir`) that survives restarts and is shared by workers on the same host.
+    Only responses that passed validation should be stored.
+    """
+
+    def __init__(self) -> None:
+        self._data: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        settings = get_settings()
+        item = self._data.get(key)
+        if item is not None:
+            raw, stored_at = item
+            if time.time() - stored_at <= settings.llm_cache_ttl_seconds:
+                self._data.move_to_end(key)
+                self.memory_hits += 1
+                return raw
+            self._data.pop(key, None)
+
+        if settings.llm_cache_dir:
+            found = await asyncio.to_thread(
+                _read_disk, Path(settings.llm_cache_dir), key, settings.llm_cache_ttl_seconds
+            )
+            if found is not None:
+                self._remember(key, found[0], found[1])
+                self.disk_hits += 1
+                return found[0]
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, raw: str) -> None:
+        settings = get_settings()
+        stored_at = time.time()
+        self._remember(key, raw, stored_at)
+        if settings.llm_cache_dir:
+            try:
+                await asyncio.to_thread(
+                _write_disk,
+                Path(settings.llm_cache_dir),
+                key,
+                raw,
+                stored_at,
+                max_entries=settings.llm_cache_disk_max_entries,
+                ttl_seconds=settings.llm_cache_ttl_seconds,
+            )
+            except OSError:
+                log_event("llm_cache", disk_write=False)
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "size": len(self._data),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.memory_hits = self.disk_hits = self.misses = 0
+
+    def _remember(self, key: str, raw: str, stored_at: float) -> None:
+        self._data[key] = (raw, stored_at)
+        self._data.move_to_end(key)
+        while len(self._data) > get_settings().llm_cache_max_entries:
+            self._data.popitem(last=False)
+
+
+def _read_disk(directory: Path, key: str, ttl_seconds: float) -> Optional[tuple[str, float]]:
+    path = directory / f"{key}.json"
+    try:
+        obj = json.loads(path.read_text(encoding="utf-8"))
+        raw, stored_at = str(obj["raw"]), float(obj["stored_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if time.time() - stored_at > ttl_seconds:
+        path.unlink(missing_ok=True)
+        return None
+    return raw, stored_at
+
+
+def _write_disk(
+    directory: Path, key: str, raw: str, stored_at: float, *, max_entries: int, ttl_seconds: float
+) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f"{key}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps({"raw": raw, "stored_at": stored_at}), encoding="utf-8")
+    os.replace(tmp, directory / f"{key}.json")
+    _prune_disk(directory, max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+
+def _prune_disk(directory: Path, *, max_entries: int, ttl_seconds: float) -> None:
+    # Drop expired files, then the oldest (by mtime) beyond the cap. Runs only after an LLM
+    # miss, so a directory scan is cheap next to the call it follows.
+    entries = []
+    for path in directory.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue  # removed by another worker
+    entries.sort()
+    cutoff = time.time() - ttl_seconds
+    excess = len(entries) - max(0, max_entries)
+    for i, (mtime, path) in enumerate(entries):
+        if i < excess or mtime < cutoff:
+            path.unlink(missing_ok=True)
+
+
+llm_plan_cache = LLMPlanCache()
@@ -1,22 +1,18 @@
 from __future__ import annotations
 
-import httpx
+import json
+from typing import AsyncIterator
 
 from app.core.config import get_settings
+from app.core.http import OPENAI, upstream_client
 
 
 OPENAI_BASE_URL = "https://api.openai.com/v1"
 
 
-async def plan_week(assignments_json: str, week_start: str) -> str:
-    """
-    Returns raw text from the model (expected to be JSON, but caller must validate/fallback).
-    """
-    settings = get_settings()
-    if not settings.openai_api_key:
-        raise RuntimeError("OPENAI_API_KEY missing")
-
-    prompt = (
+def plan_week_prompt(assignments_json: str, week_start: str) -> str:
+    # Separate so callers can key caches on the exact prompt sent.
+    return (
         "You are a study planner. Output ONLY valid JSON for WeeklyPlan with fields:\n"
         '{ "weekStart": "YYYY-MM-DD", "items": [ { "id": "string", "title": "string", '
         '"dueDate": "ISO8601 or null", "estimatedMinutes": 10-20, "status": "todo|doing|done", '
@@ -28,13 +24,24 @@ async def plan_week(assignments_json: str, week_start: str) -> str:
         f"{assignments_json}\n"
     )
 
+
+async def plan_week(assignments_json: str, week_start: str) -> str:
+    """
+    Returns raw text from the model (expected to be JSON, but caller must validate/fallback).
+    """
+    settings = get_settings()
+    if not settings.openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY missing")
+
+    prompt = plan_week_prompt(assignments_json, week_start)
+
     headers = {"Authorization": f"Bearer {settings.openai_api_key}"}
     payload = {
-        "model": "gpt-4.1-mini",
+        "model": settings.openai_model,
         "input": prompt,
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with upstream_client(OPENAI) as client:
         r = await client.post(f"{OPENAI_BASE_URL}/responses", json=payload, headers=headers)
         r.raise_for_status()
         data = r.json()
@@ -56,18 +63,12 @@ async def coach_text(user_message: str, best_next_action_title: str, minutes: in
     if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY missing")
 
-    prompt = (
-        "You are a supportive study coach. Keep it short (1-3 sentences).\n"
-        "You MUST include a concrete 10–20 minute starter for the next action.\n"
-        f"Next action: {best_next_action_title}.\n"
-        f"Starter duration: {minutes} minutes.\n"
-        f"Student message: {user_message}\n"
-    )
+    prompt = _coach_prompt(user_message, best_next_action_title, minutes)
 
     headers = {"Authorization": f"Bearer {settings.openai_api_key}"}
-    payload = {"model": "gpt-4.1-mini", "input": prompt}
+    payload = {"model": settings.openai_model, "input": prompt}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with upstream_client(OPENAI) as client:
         r = await client.post(f"{OPENAI_BASE_URL}/responses", json=payload, headers=headers)
         r.raise_for_status()
         data = r.json()
@@ -83,3 +84,47 @@ async def coach_text(user_message: str, best_next_action_title: str, minutes: in
     return "\n".join(texts).strip()
 
 
+async def coach_text_stream(
+    user_message: str, best_next_action_title: str, minutes: int
+) -> AsyncIterator[str]:
+    """
+    Yields coaching text deltas from the Responses streaming API as they arrive.
+    Raises on upstream errors (also mid-stream); caller owns the fallback.
+    """
+    settings = get_settings()
+    if not settings.openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY missing")
+
+    prompt = _coach_prompt(user_message, best_next_action_title, minutes)
+    headers = {"Authorization": f"Bearer {settings.openai_api_key}"}
+    payload = {"model": settings.openai_model, "input": prompt, "stream": True}
+
+    async with upstream_client(OPENAI) as client:
+        async with client.stream(
+            "POST", f"{OPENAI_BASE_URL}/responses", json=payload, headers=headers
+        ) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                event = json.loads(data)
+                kind = event.get("type")
+                if kind == "response.output_text.delta" and isinstance(event.get("delta"), str):
+                    yield event["delta"]
+                elif kind in ("response.failed", "response.incomplete", "error"):
+                    raise RuntimeError(f"OpenAI stream {kind}")
+                elif kind == "response.completed":
+                    return
+
+
+def _coach_prompt(user_message: str, best_next_action_title: str, minutes: int) -> str:
+    return (
+        "You are a supportive study coach. Keep it short (1-3 sentences).\n"
+        "You MUST include a concrete 10–20 minute starter for the next action.\n"
+        f"Next action: {best_next_action_title}.\n"
+        f"Starter duration: {minutes} minutes.\n"
+        f"Student message: {user_message}\n"
+    )
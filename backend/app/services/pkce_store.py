@@ -1,34 +1,113 @@
 from __future__ import annotations
 
 import time
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+from app.core.config import get_settings
+from app.core.db import get_conn
+
+
+class PKCEBackend(Protocol):
+    def put(self, state: str, verifier: str) -> None: ...
+
+    def pop(self, state: str) -> Optional[str]: ...
 
 
 class PKCEStore:
-    def __init__(self, ttl_seconds: int = 600) -> None:
+    """
+    Process-local OAuth state -> PKCE verifier map.
+
+    With a fixed TTL, insertion order is expiry order, so expired entries are always at the
+    front and cleanup only looks at what it removes (amortized O(1) per call). Past
+    `max_entries` the oldest pending login is dropped, so a burst of /auth/google/start calls
+    can't grow memory without bound.
+    """
+
+    def __init__(self, ttl_seconds: int = 600, max_entries: int = 10000) -> None:
         self.ttl_seconds = ttl_seconds
-        self._data: dict[str, tuple[str, float]] = {}
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[str, float]] = OrderedDict()
 
     def put(self, state: str, verifier: str) -> None:
-        self._data[state] = (verifier, time.time() + self.ttl_seconds)
+        now = time.monotonic()
+        self._gc(now)
+        self._data.pop(state, None)
+        while len(self._data) >= self.max_entries:
+            self._data.popitem(last=False)
+        self._data[state] = (verifier, now + self.ttl_seconds)
 
     def pop(self, state: str) -> Optional[str]:
-        self._gc()
+        now = time.monotonic()
+        self._gc(now)
         item = self._data.pop(state, None)
         if not item:
             return None
         verifier, expires_at = item
-        if time.time() > expires_at:
+        if now > expires_at:
             return None
         return verifier
 
-    def _gc(self) -> None:
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def _gc(self, now: float) -> None:
+        while self._data:
+            _, (_, expires_at) = next(iter(self._data.items()))
+            if now <= expires_at:
+                return
+            self._data.popitem(last=False)
+
+
+class SQLitePKCEStore:
+    """
+    PKCE state in the shared SQLite database (`pkce_states`), so the OAuth callback can land
+    on any worker (`uvicorn --workers N`). Blocking: call from a threadpool, not the event loop.
+    """
+
+    def __init__(self, ttl_seconds: int = 600, max_entries: int = 10000) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def put(self, state: str, verifier: str) -> None:
         now = time.time()
-        expired = [k for k, (_, exp) in self._data.items() if now > exp]
-        for k in expired:
-            self._data.pop(k, None)
+        conn = get_conn()
+        with conn:
+            conn.execute("DELETE FROM pkce_states WHERE expires_at < ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO pkce_states (state, verifier, expires_at) VALUES (?, ?, ?)",
+                (state, verifier, now + self.ttl_seconds),
+            )
+            conn.execute(
+                """
+                DELETE FROM pkce_states WHERE state IN (
+                  SELECT state FROM pkce_states ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def pop(self, state: str) -> Optional[str]:
+        conn = get_conn()
+        with conn:
+            # Single statement, so two workers can never both consume the same state.
+            row = conn.execute(
+                "DELETE FROM pkce_states WHERE state=? RETURNING verifier, expires_at", (state,)
+            ).fetchone()
+        if row is None or time.time() > row["expires_at"]:
+            return None
+        return row["verifier"]
 
 
 pkce_store = PKCEStore()
+sqlite_pkce_store = SQLitePKCEStore()
 
 
+def get_pkce_store() -> PKCEBackend:
+    # "memory" (default, single process) or "sqlite" (shared across workers).
+    if get_settings().pkce_store_backend == "sqlite":
+        return sqlite_pkce_store
+    return pkce_store
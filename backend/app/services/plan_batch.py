@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncIterator
+
+from app.core.config import get_settings
+from app.core.http import cap_upstream_calls
+from app.core.logging import log_event
+from app.services.planning import generate_weekly_plan_with_fallback
+
+
+async def iter_batch_plans(user_ids: list[str], *, refresh: bool = False) -> AsyncIterator[dict]:
+    """
+    Weekly plans for many users, yielded as each one completes (not in input order).
+
+    At most `plan_batch_max_concurrency` plans run at once, and their Google/OpenAI calls
+    take the per-upstream slots in app.core.http (interactive traffic doesn't). Duplicate ids are
+    planned once. A failing user yields an error line instead of failing the batch.
+    """
+    settings = get_settings()
+    semaphore = asyncio.Semaphore(max(1, settings.plan_batch_max_concurrency))
+    started = time.perf_counter()
+
+    async def plan_one(user_id: str) -> dict:
+        # Each task has its own context, so this only applies to the batch.
+        cap_upstream_calls()
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                plan, meta = await generate_weekly_plan_with_fallback(user_id=user_id, refresh=refresh)
+            except Exception as e:
+                return {"user_id": user_id, "ok": False, "error": type(e).__name__}
+            return {
+                "user_id": user_id,
+                "ok": True,
+                "planner": meta.get("planner"),
+                "plan_source": meta.get("plan_source"),
+                "used_classroom": meta.get("used_classroom", False),
+                "ms": round((time.perf_counter() - t0) * 1000),
+                "plan": plan.model_dump(),
+            }
+
+    tasks = [asyncio.ensure_future(plan_one(u)) for u in dict.fromkeys(user_ids)]
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            failed += not result["ok"]
+            yield result
+    finally:
+        # Client went away mid-stream: don't keep planning for nobody.
+        for t in tasks:
+            t.cancel()
+        log_event(
+            "plan_batch",
+            users=len(tasks),
+            failed=failed,
+            concurrency=settings.plan_batch_max_concurrency,
+            wall_ms=round((time.perf_counter() - started) * 1000),
+        )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.db import get_conn
+from app.models.schemas import WeeklyPlan
+
+
+# Weekly plans per (user_id, weekStart). Sync functions: run through `db_executor`.
+
+
+@dataclass(frozen=True)
+class StoredPlan:
+    plan: WeeklyPlan
+    fingerprint: str  # hash of the assignments the plan was generated from
+    planner: str
+
+
+def read_plan(user_id: str, week_start: str) -> Optional[StoredPlan]:
+    row = get_conn().execute(
+        "SELECT plan_json, fingerprint, planner FROM weekly_plans WHERE user_id=? AND week_start=?",
+        (user_id, week_start),
+    ).fetchone()
+    if not row:
+        return None
+    return StoredPlan(
+        plan=WeeklyPlan.model_validate_json(row["plan_json"]),
+        fingerprint=row["fingerprint"],
+        planner=row["planner"],
+    )
+
+
+def write_plan(
+    conn: sqlite3.Connection, user_id: str, plan: WeeklyPlan, *, fingerprint: str, planner: str
+) -> None:
+    conn.execute(
+        """
+        INSERT INTO weekly_plans (user_id, week_start, plan_json, fingerprint, planner, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(user_id, week_start) DO UPDATE SET
+          plan_json=excluded.plan_json,
+          fingerprint=excluded.fingerprint,
+          planner=excluded.planner,
+          updated_at=excluded.updated_at
+        """,
+        (user_id, plan.weekStart, plan.model_dump_json(), fingerprint, planner, int(time.time())),
+    )
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import heapq
 from datetime import date, datetime
 from math import ceil
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Union
 
+from app.models.records import AssignmentRecord, parse_due
 from app.models.schemas import Assignment, PlanItem, WeeklyPlan, new_id, week_start_iso
 
 
@@ -47,7 +49,7 @@ def stub_assignments() -> list[Assignment]:
 
 
 def generate_weekly_plan(
-    assignments: Iterable[Assignment],
+    assignments: Iterable[Union[AssignmentRecord, Assignment]],
     *,
     today: Optional[date] = None,
     cap_items: int = MAX_PLAN_ITEMS,
@@ -55,13 +57,17 @@ def generate_weekly_plan(
     today = today or date.today()
     week_start = date.fromisoformat(week_start_iso(today))
 
-    sorted_assignments = sorted(
-        list(assignments),
-        key=lambda a: (_due_date_sort_key(a.dueDate), a.title.lower()),
+    # Every assignment yields at least one item, so only the first `cap_items` in due order can
+    # make the plan: pick them with a bounded heap instead of sorting the whole history. Each due
+    # date is parsed once; the input index keeps ties in input order, as the stable sort did.
+    keyed = (
+        (_due_key(_due_at(a)), a.title.lower(), idx, a)
+        for idx, a in enumerate(assignments)
     )
+    selected = [entry[-1] for entry in heapq.nsmallest(max(0, cap_items), keyed)]
 
     items: list[PlanItem] = []
-    for a in sorted_assignments:
+    for a in selected:
         parts = _split_minutes(a.estimatedMinutes)
         total_parts = len(parts)
         for part_idx, mins in enumerate(parts, start=1):
@@ -141,19 +147,23 @@ def _plan_item_title(
 
 
 def _due_date_sort_key(due_iso: Optional[str]) -> tuple[int, str]:
-    # Missing due date is lowest priority (last).
-    if not due_iso:
-        return (1, "9999-12-31")
-    # Accept ISO8601 datetime or date.
-    try:
-        if "T" in due_iso:
-            parsed = datetime.fromisoformat(due_iso.replace("Z", "+00:00")).date()
-        else:
-            parsed = date.fromisoformat(due_iso)
-        return (0, parsed.isoformat())
-    except Exception:
-        # If malformed, treat as missing (lowest priority).
+    # Missing or malformed due date is lowest priority (last).
+    parsed = parse_due(due_iso)
+    if parsed is None:
         return (1, "9999-12-31")
+    return (0, parsed.date().isoformat())
+
+
+def _due_at(a: Union[AssignmentRecord, Assignment]) -> Optional[datetime]:
+    # Records carry the parsed due date; API models (tests, scripts) are parsed here.
+    return a.due_at if isinstance(a, AssignmentRecord) else parse_due(a.dueDate)
+
+
+def _due_key(due_at: Optional[datetime]) -> tuple[int, date]:
+    # Same order as `_due_date_sort_key`: by calendar day of the due date, undated last.
+    if due_at is None:
+        return (1, date.max)
+    return (0, due_at.date())
 
 
 def _days_from_today_iso(days: int) -> str:
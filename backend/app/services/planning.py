@@ -1,40 +1,220 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import time
 from datetime import date
 from typing import Optional, Tuple
 
 from app.core.config import get_settings
+from app.core.db_executor import db_executor
+from app.core.logging import log_event
+from app.core.metrics import record_fallback, stage
+from app.models.records import AssignmentRecord
 from app.models.schemas import PlanItem, WeeklyPlan, week_start_iso
 from app.services.assignment_source import select_assignments
-from app.services.openai_client import plan_week
+from app.services.llm_cache import llm_plan_cache
+from app.services.openai_client import plan_week, plan_week_prompt
+from app.services.plan_store import StoredPlan, read_plan, write_plan
 from app.services.planner import generate_weekly_plan, pick_best_next_action
 from app.services.rails import normalize_weekly_plan, rails_enforce
 
 
 async def generate_weekly_plan_with_fallback(
-    *, user_id: Optional[str], today: Optional[date] = None
+    *, user_id: Optional[str], today: Optional[date] = None, refresh: bool = False
 ) -> Tuple[WeeklyPlan, dict]:
+    plan, meta, _assignments = await generate_weekly_plan_with_assignments(
+        user_id=user_id, today=today, refresh=refresh
+    )
+    return plan, meta
+
+
+async def generate_weekly_plan_with_assignments(
+    *, user_id: Optional[str], today: Optional[date] = None, refresh: bool = False
+) -> Tuple[WeeklyPlan, dict, list[AssignmentRecord]]:
+    """Like `generate_weekly_plan_with_fallback`, also returning the assignments it planned from."""
     today = today or date.today()
     assignments, src_meta = await select_assignments(user_id)
 
+    # Anonymous plans come from the shared fixture/stub, so they're the same for everyone on a
+    # given day: build each once and hand out copies (`refresh` rebuilds it).
+    memo_key = _anonymous_plan_key(assignments, today) if user_id is None else None
+    if memo_key is not None and not refresh and memo_key in _anonymous_plans:
+        memo, planner = _anonymous_plans[memo_key]
+        meta = {"planner": planner, "plan_source": "memo", **src_meta}
+        return memo.model_copy(deep=True), meta, assignments
+
+    # Signed-in users get a stored plan per week, regenerated only when their assignments
+    # change or the client asks (`refresh`); item ids then stay stable across requests.
+    fingerprint = _assignments_fingerprint(assignments) if user_id else None
+    if user_id and not refresh:
+        stored = await _read_stored_plan(user_id, week_start_iso(today))
+        if stored is not None and stored.fingerprint == fingerprint:
+            log_event("plan", planner=stored.planner, plan_source="store", fallback_reason="none")
+            meta = {"planner": stored.planner, "plan_source": "store", **src_meta}
+            return stored.plan, meta, assignments
+
+    plan, planner, gen_meta = await _generate_plan(assignments, today=today)
+    # A hedged plan that lost only on time will be upgraded from the LLM cache on the next
+    # request, so don't pin it in the store.
+    provisional = gen_meta.get("hedge", {}).get("reason") == "deadline"
+    # Don't pin an LLM fallback for the week (or the day); the next request retries the LLM.
+    fell_back = bool(get_settings().openai_api_key) and planner != "llm"
+    if user_id and fingerprint and not provisional and not fell_back:
+        await _store_plan(user_id, plan, fingerprint=fingerprint, planner=planner)
+    if memo_key is not None and not provisional and not fell_back:
+        _remember_anonymous_plan(memo_key, plan, planner)
+        plan = plan.model_copy(deep=True)
+    return plan, {"planner": planner, "plan_source": "generated", **gen_meta, **src_meta}, assignments
+
+
+async def _generate_plan(assignments, *, today: date) -> Tuple[WeeklyPlan, str, dict]:
     settings = get_settings()
+    if settings.openai_api_key and settings.planner_mode == "hedged":
+        return await _hedged_plan(assignments, today=today)
+
     if settings.openai_api_key:
         try:
-            raw = await plan_week(_assignments_json(assignments), week_start_iso(today))
-            obj = json.loads(raw)
-            plan = normalize_weekly_plan(obj, today=today)
-            if plan is None:
-                raise ValueError("normalize_failed")
-            plan = rails_enforce(plan, today=today)
-            print("planner=llm fallback_reason=none")
-            return plan, {"planner": "llm", **src_meta}
+            plan, cache_state = await _llm_plan(assignments, today=today)
+            log_event("plan", planner="llm", fallback_reason="none", llm_cache=cache_state)
+            return plan, "llm", {}
         except Exception:
-            print("planner=deterministic fallback_reason=llm_failed")
+            log_event("plan", planner="deterministic", fallback_reason="llm_failed")
+            record_fallback("planner", "llm_failed")
+
+    return _deterministic_plan(assignments, today=today), "deterministic", {}
+
+
+async def _hedged_plan(assignments, *, today: date) -> Tuple[WeeklyPlan, str, dict]:
+    # Race the LLM against a latency budget with the deterministic plan already in hand.
+    settings = get_settings()
+    deadline_ms = settings.planner_deadline_seconds * 1000
+    started = time.perf_counter()
+    llm_task = asyncio.ensure_future(_llm_plan(assignments, today=today))
+    fallback = _deterministic_plan(assignments, today=today)
+    deterministic_ms = (time.perf_counter() - started) * 1000
+
+    remaining = max(0.0, settings.planner_deadline_seconds - (time.perf_counter() - started))
+    try:
+        plan, cache_state = await asyncio.wait_for(asyncio.shield(llm_task), timeout=remaining)
+        llm_ms = (time.perf_counter() - started) * 1000
+        hedge = {
+            "winner": "llm",
+            "reason": "none",
+            "llm_ms": round(llm_ms, 1),
+            "deterministic_ms": round(deterministic_ms, 1),
+            "deadline_ms": deadline_ms,
+            # How far under budget the LLM came in.
+            "margin_ms": round(deadline_ms - llm_ms, 1),
+        }
+        log_event(
+            "plan",
+            planner="llm",
+            fallback_reason="none",
+            llm_cache=cache_state,
+            hedge_margin_ms=hedge["margin_ms"],
+        )
+        return plan, "llm", {"hedge": hedge}
+    except asyncio.TimeoutError:
+        reason = "deadline"
+        if settings.planner_hedge_background:
+            # Let it finish so its result lands in the LLM plan cache for the next request.
+            _background_tasks.add(llm_task)
+            llm_task.add_done_callback(_forget_background)
+        else:
+            llm_task.cancel()
+    except Exception:
+        reason = "llm_failed"
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    hedge = {
+        "winner": "deterministic",
+        "reason": reason,
+        "llm_ms": round(elapsed_ms, 1) if reason == "llm_failed" else None,
+        "deterministic_ms": round(deterministic_ms, 1),
+        "deadline_ms": deadline_ms,
+        # How long the deterministic plan was ready before the LLM finished (or gave up).
+        "margin_ms": round(elapsed_ms - deterministic_ms, 1),
+    }
+    log_event(
+        "plan", planner="deterministic", fallback_reason=f"llm_{reason}", hedge_margin_ms=hedge["margin_ms"]
+    )
+    record_fallback("planner", "llm_deadline" if reason == "deadline" else "llm_failed")
+    return fallback, "deterministic", {"hedge": hedge}
+
+
+_background_tasks: set[asyncio.Task] = set()
+
 
+def _forget_background(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        log_event("plan", planner="llm_background", fallback_reason="llm_failed")
+
+
+async def _llm_plan(assignments, *, today: date) -> Tuple[WeeklyPlan, str]:
+    with stage("llm_plan"):
+        settings = get_settings()
+        assignments_json = _assignments_json(assignments)
+        week_start = week_start_iso(today)
+        cache_key = llm_plan_cache.key(settings.openai_model, plan_week_prompt(assignments_json, week_start))
+        raw = await llm_plan_cache.get(cache_key)
+        cache_state = "hit" if raw is not None else "miss"
+        if raw is None:
+            raw = await plan_week(assignments_json, week_start)
+        obj = json.loads(raw)
+        plan = normalize_weekly_plan(obj, today=today)
+        if plan is None:
+            raise ValueError("normalize_failed")
+        with stage("rails"):
+            plan = rails_enforce(plan, today=today)
+        if cache_state == "miss":
+            # Only responses that made it through the rails are worth replaying.
+            await llm_plan_cache.put(cache_key, raw)
+        return plan, cache_state
+
+
+def _deterministic_plan(assignments, *, today: date) -> WeeklyPlan:
     plan = generate_weekly_plan(assignments, today=today)
-    plan = rails_enforce(plan, today=today)
-    return plan, {"planner": "deterministic", **src_meta}
+    with stage("rails"):
+        return rails_enforce(plan, today=today)
+
+
+async def _read_stored_plan(user_id: str, week_start: str) -> Optional[StoredPlan]:
+    try:
+        return await db_executor.read(read_plan, user_id, week_start)
+    except Exception:
+        # The plan store is an optimization; planning must still succeed without it.
+        log_event("plan_store", ok=False, fallback_reason="read_failed")
+        record_fallback("plan_store", "read_failed")
+        return None
+
+
+async def _store_plan(user_id: str, plan: WeeklyPlan, *, fingerprint: str, planner: str) -> None:
+    try:
+        await db_executor.write(
+            lambda conn: write_plan(conn, user_id, plan, fingerprint=fingerprint, planner=planner)
+        )
+    except Exception:
+        log_event("plan_store", ok=False, fallback_reason="write_failed")
+        record_fallback("plan_store", "write_failed")
+
+
+_anonymous_plans: dict[tuple[str, ...], tuple[WeeklyPlan, str]] = {}
+
+
+def _anonymous_plan_key(assignments, today: date) -> tuple[str, ...]:
+    settings = get_settings()
+    llm = f"{settings.planner_mode}:{settings.openai_model}" if settings.openai_api_key else "off"
+    return (today.isoformat(), llm, _assignments_fingerprint(assignments))
+
+
+def _remember_anonymous_plan(key: tuple[str, ...], plan: WeeklyPlan, planner: str) -> None:
+    # Only today's plans are worth keeping.
+    for stale in [k for k in _anonymous_plans if k[0] != key[0]]:
+        del _anonymous_plans[stale]
+    _anonymous_plans[key] = (plan, planner)
 
 
 def best_next_action_from_plan(plan: WeeklyPlan) -> PlanItem:
@@ -57,3 +237,6 @@ def _assignments_json(assignments) -> str:
     return json.dumps(safe, ensure_ascii=False)
 
 
+def _assignments_fingerprint(assignments) -> str:
+    # Covers exactly what planning looks at (the same fields sent to the LLM).
+    return hashlib.sha256(_assignments_json(assignments).encode("utf-8")).hexdigest()
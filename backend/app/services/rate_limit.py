@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable, Hashable, Optional
+
+from app.core.config import get_settings
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second up to `capacity`. Callers reserve a token and sleep until it
+    exists, so the balance can go negative: that's the queue, served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float, now: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic() if now is None else now
+
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+
+class RateLimiter:
+    """
+    Outbound limiter with one global bucket and one bucket per key (e.g. user).
+
+    `acquire` waits for a slot in both; when the wait would exceed `max_wait_seconds` it
+    raises ConnectionError("<name>_throttled") instead, so callers fall back like on any other
+    upstream failure. A full per-key bucket is the same as a fresh one, so idle keys are
+    dropped. Limits are read from settings via `config` on every call; a rate <= 0 disables
+    that bucket.
+    """
+
+    def __init__(self, name: str, config: Callable[[], tuple[float, ...]]) -> None:
+        # config() -> (global_rate, global_burst, per_key_rate, per_key_burst, max_wait_seconds)
+        self.name = name
+        self._config = config
+        self._global: Optional[TokenBucket] = None
+        self._buckets: dict[Hashable, TokenBucket] = {}
+        self.waiting = 0
+        self.max_waiting = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.retries = 0
+
+    async def acquire(self, key: Hashable) -> None:
+        global_rate, global_burst, key_rate, key_burst, max_wait = self._config()
+        now = time.monotonic()
+        buckets: list[TokenBucket] = []
+        if global_rate > 0:
+            current = self._global
+            if current is None or (current.rate, current.capacity) != (global_rate, global_burst):
+                self._global = TokenBucket(global_rate, global_burst, now)
+            buckets.append(self._global)
+        if key_rate > 0:
+            buckets.append(self._bucket(key, key_rate, key_burst, now))
+        wait = max((b.wait_time(now) for b in buckets), default=0.0)
+        if wait > max_wait:
+            self.rejected += 1
+            raise ConnectionError(f"{self.name}_throttled")
+        for b in buckets:
+            b.take()
+        if wait <= 0:
+            return
+        self.throttled += 1
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            self.waiting -= 1
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "tracked_keys": len(self._buckets),
+        }
+
+    def reset(self) -> None:
+        self._global = None
+        self._buckets.clear()
+        self.waiting = self.max_waiting = self.throttled = self.rejected = self.retries = 0
+
+    def _bucket(self, key: Hashable, rate: float, burst: float, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None or (bucket.rate, bucket.capacity) != (rate, burst):
+            if len(self._buckets) >= 1024:
+                for k in [k for k, b in self._buckets.items() if b.is_full(now)]:
+                    del self._buckets[k]
+            bucket = self._buckets[key] = TokenBucket(rate, burst, now)
+        return bucket
+
+
+def _classroom_config() -> tuple[float, float, float, float, float]:
+    s = get_settings()
+    return (
+        s.classroom_rate_global,
+        s.classroom_burst_global,
+        s.classroom_rate_per_user,
+        s.classroom_burst_per_user,
+        s.classroom_max_wait_seconds,
+    )
+
+
+# Google Classroom quotas are per project and per user.
+classroom_limiter = RateLimiter("google", _classroom_config)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one in-flight call.
+
+    Every waiter gets the shared result or exception; the key is released as soon as the call
+    finishes, so a failure never sticks to later calls. The call runs in its own task, so a
+    cancelled waiter doesn't cancel it for the others.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        fut = self._inflight.get(key)
+        if fut is not None and not fut.done():
+            self.coalesced += 1
+            return await asyncio.shield(fut)
+
+        self.calls += 1
+        fut = asyncio.ensure_future(fn())
+        self._inflight[key] = fut
+
+        def release(f: asyncio.Future) -> None:
+            if self._inflight.get(key) is f:
+                del self._inflight[key]
+            if not f.cancelled():
+                # Mark the exception retrieved even when every waiter went away.
+                f.exception()
+
+        fut.add_done_callback(release)
+        return await asyncio.shield(fut)
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "coalesced": self.coalesced, "inflight": len(self._inflight)}
+
+    def reset(self) -> None:
+        self._inflight.clear()
+        self.calls = 0
+        self.coalesced = 0
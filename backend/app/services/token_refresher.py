@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.http import GOOGLE, upstream_client
+from app.core.logging import log_event
+from app.core.metrics import stage
+from app.core.token_store import token_store
+from app.services.singleflight import SingleFlight
+
+
+class TokenRefresher:
+    """
+    Keeps access tokens of recently active users fresh ahead of expiry.
+
+    A background loop refreshes tokens that expire within `token_refresh_lead_seconds` for users
+    seen in the last `token_refresh_active_window_seconds`. All refreshes (background or inline)
+    go through a per-user single flight, so at most one token request per user is in flight.
+    """
+
+    def __init__(self, max_tracked_users: int = 10000) -> None:
+        self.max_tracked_users = max_tracked_users
+        self._active: dict[str, float] = {}
+        self._flights = SingleFlight()
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.background_refreshes = 0
+        self.failures = 0
+
+    def mark_active(self, user_id: str) -> None:
+        self._active.pop(user_id, None)
+        self._active[user_id] = time.monotonic()
+        if len(self._active) > self.max_tracked_users:
+            # Oldest activity first (insertion order); drop it.
+            self._active.pop(next(iter(self._active)))
+
+    async def ensure_fresh(self, user_id: str, *, min_valid_seconds: int) -> str:
+        """Return an access token valid for at least `min_valid_seconds`, refreshing if needed."""
+        return await self._flights.do(
+            user_id, lambda: self._refresh_if_needed(user_id, min_valid_seconds)
+        )
+
+    async def refresh_due(self) -> int:
+        settings = get_settings()
+        cutoff = time.monotonic() - settings.token_refresh_active_window_seconds
+        for user_id in [u for u, seen in self._active.items() if seen < cutoff]:
+            self._active.pop(user_id, None)
+
+        refreshed = 0
+        for user_id in list(self._active):
+            tok = await token_store.get(user_id)
+            if not tok or not tok.get("refresh_token"):
+                continue
+            if not _expires_within(tok, settings.token_refresh_lead_seconds):
+                continue
+            try:
+                await self.ensure_fresh(user_id, min_valid_seconds=settings.token_refresh_lead_seconds)
+                refreshed += 1
+            except Exception:
+                self.failures += 1
+                log_event("token_refresh_background", ok=False)
+        self.background_refreshes += refreshed
+        return refreshed
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "tracked_users": len(self._active),
+            "refreshes": self.refreshes,
+            "background_refreshes": self.background_refreshes,
+            "failures": self.failures,
+            "deduplicated": self._flights.coalesced,
+        }
+
+    def reset(self) -> None:
+        self._active.clear()
+        self._flights.reset()
+        self.refreshes = self.background_refreshes = self.failures = 0
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(get_settings().token_refresh_interval_seconds)
+            try:
+                await self.refresh_due()
+            except Exception:
+                log_event("token_refresh_background", ok=False)
+
+    async def _refresh_if_needed(self, user_id: str, min_valid_seconds: int) -> str:
+        # Re-read: a refresh that just finished may already have stored a good token.
+        tok = await token_store.get(user_id)
+        if not tok or not tok.get("access_token"):
+            raise PermissionError("no_tokens")
+        if not _expires_within(tok, min_valid_seconds):
+            return tok["access_token"]
+        refresh_token = tok.get("refresh_token")
+        if not refresh_token:
+            raise PermissionError("no_refresh_token")
+        self.refreshes += 1
+        return await _refresh_access_token(user_id, refresh_token)
+
+
+def _expires_within(tok: dict, seconds: int) -> bool:
+    expires_at = tok.get("expires_at")
+    return bool(expires_at) and int(expires_at) <= int(time.time()) + seconds
+
+
+async def _refresh_access_token(user_id: str, refresh_token: str) -> str:
+    settings = get_settings()
+    if not settings.google_client_id:
+        raise PermissionError("oauth_not_configured")
+
+    payload = {
+        "client_id": settings.google_client_id,
+        "grant_type": "refresh_token",
+        "refresh_token": refresh_token,
+    }
+    if settings.google_client_secret:
+        payload["client_secret"] = settings.google_client_secret
+
+    with stage("token_refresh"):
+        try:
+            # Uncapped: concurrent requests for this user wait on the refresh.
+            async with upstream_client(GOOGLE, capped=False) as client:
+                r = await client.post("https://oauth2.googleapis.com/token", data=payload)
+                if r.status_code == 429 or r.status_code >= 500:
+                    # Google trouble rather than a bad grant; raised inside the block so the
+                    # circuit breaker counts it.
+                    r.raise_for_status()
+                if r.status_code != 200:
+                    raise PermissionError("refresh_failed")
+                tok = r.json()
+                access_token = tok.get("access_token")
+                expires_in = tok.get("expires_in")
+                token_type = tok.get("token_type")
+                scope = tok.get("scope")
+                if not access_token:
+                    raise PermissionError("refresh_failed")
+        except httpx.HTTPStatusError:
+            raise PermissionError("refresh_failed")
+
+    expires_at = int(time.time() + int(expires_in)) if expires_in else None
+    await token_store.upsert(
+        user_id=user_id,
+        access_token=access_token,
+        refresh_token=None,  # keep existing
+        expires_at=expires_at,
+        token_type=token_type,
+        scope=scope,
+        id_token=None,
+    )
+    return access_token
+
+
+token_refresher = TokenRefresher()
@@ -0,0 +1,99 @@
+"""
+Allocation and time of the planning pipeline with pydantic models vs. slotted records.
+
+Normalizes N Classroom courseWork payloads and builds the deterministic weekly plan from them,
+once via `Assignment` models (the previous representation) and once via `AssignmentRecord`,
+reporting tracemalloc peak / retained memory and wall time.
+
+    cd backend && python3 benchmarks/bench_assignment_records.py [assignments] [courses]
+"""
+from __future__ import annotations
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.models.schemas import Assignment  # noqa: E402
+from app.services.classroom import _due_at, _normalize_coursework  # noqa: E402
+from app.services.planner import generate_weekly_plan  # noqa: E402
+
+
+def _payloads(n: int, courses: int) -> list[tuple[list[dict], str]]:
+    rng = random.Random(3)
+    per_course: dict[int, list[dict]] = {}
+    for i in range(n):
+        day = date.fromordinal(date(2024, 9, 1).toordinal() + rng.randrange(600))
+        work = {
+            "id": f"w{i}",
+            "title": f"Assignment {i}",
+            "description": "Read the chapter and answer the questions. " * rng.randrange(1, 4),
+            "alternateLink": f"https://classroom.google.com/c/x/a/{i}",
+        }
+        if rng.random() < 0.8:
+            work["dueDate"] = {"year": day.year, "month": day.month, "day": day.day}
+            work["dueTime"] = {"hours": 23, "minutes": 59}
+        per_course.setdefault(i % courses, []).append(work)
+    # Each course name arrives as its own string, as it would from separate JSON responses.
+    return [(page, "".join(["Course ", str(c)])) for c, page in per_course.items()]
+
+
+def _as_models(payloads) -> list[Assignment]:
+    out: list[Assignment] = []
+    for page, course_name in payloads:
+        for w in page:
+            due_at = _due_at(w.get("dueDate"), w.get("dueTime"))
+            out.append(
+                Assignment(
+                    id=str(w["id"]),
+                    title=str(w["title"]),
+                    dueDate=due_at.isoformat() if due_at else None,
+                    courseName=str(course_name),
+                    description=w.get("description"),
+                    url=w.get("alternateLink"),
+                    estimatedMinutes=None,
+                )
+            )
+    return out
+
+
+def _as_records(payloads):
+    out = []
+    for page, course_name in payloads:
+        out.extend(_normalize_coursework(page, course_name))
+    return out
+
+
+def _measure(label: str, build, payloads, today: date) -> None:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    assignments = build(payloads)
+    generate_weekly_plan(assignments, today=today)
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<18} assignments={len(assignments)} peak_kib={peak / 1024:.0f} "
+        f"retained_kib={retained / 1024:.0f} wall_ms={elapsed * 1000:.1f}"
+    )
+    del assignments
+
+
+def main(n: int, courses: int) -> None:
+    payloads = _payloads(n, courses)
+    today = date(2026, 1, 14)
+    _measure("pydantic models", _as_models, payloads, today)
+    _measure("slotted records", _as_records, payloads, today)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 40,
+    )
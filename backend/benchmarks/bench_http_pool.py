@@ -0,0 +1,100 @@
+"""
+Handshake savings of the pooled upstream client vs. a fresh httpx.AsyncClient per call.
+
+Runs a tiny local HTTPS keep-alive server (self-signed cert via the `openssl` CLI) as a
+stand-in for googleapis.com / api.openai.com, then times N sequential GETs both ways.
+
+    cd backend && python3 benchmarks/bench_http_pool.py [requests]
+"""
+from __future__ import annotations
+
+import asyncio
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from app.core.http import build_client  # noqa: E402
+
+_RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json\r\n"
+    b"Content-Length: 2\r\n"
+    b"Connection: keep-alive\r\n\r\n{}"
+)
+
+
+def _self_signed_cert(tmp: Path) -> tuple[Path, Path]:
+    cert, key = tmp / "cert.pem", tmp / "key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+            "-keyout", str(key), "-out", str(cert), "-days", "1",
+            "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+async def _serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, stats: dict) -> None:
+    stats["connections"] += 1
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            writer.write(_RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _timed(n: int, url: str, cert: Path, *, pooled: bool) -> float:
+    verify = ssl.create_default_context(cafile=str(cert))
+    started = time.perf_counter()
+    if pooled:
+        async with build_client(verify=verify) as client:
+            for _ in range(n):
+                (await client.get(url)).raise_for_status()
+    else:
+        for _ in range(n):
+            async with httpx.AsyncClient(timeout=10.0, verify=verify) as client:
+                (await client.get(url)).raise_for_status()
+    return time.perf_counter() - started
+
+
+async def main(n: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = _self_signed_cert(Path(tmp))
+        server_ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        server_ctx.load_cert_chain(str(cert), str(key))
+
+        stats = {"connections": 0}
+        server = await asyncio.start_server(
+            lambda r, w: _serve(r, w, stats), "127.0.0.1", 0, ssl=server_ctx
+        )
+        port = server.sockets[0].getsockname()[1]
+        url = f"https://localhost:{port}/v1/ping"
+
+        async with server:
+            for label, pooled in (("fresh client per call", False), ("pooled client", True)):
+                stats["connections"] = 0
+                elapsed = await _timed(n, url, cert, pooled=pooled)
+                print(
+                    f"{label:<22} requests={n} connections={stats['connections']} "
+                    f"total_ms={elapsed * 1000:.1f} per_request_ms={elapsed * 1000 / n:.2f}"
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
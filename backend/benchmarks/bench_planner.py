@@ -0,0 +1,100 @@
+"""
+Deterministic planner on a long assignment history: top-k selection vs. a full sort.
+
+Builds N assignments (mixed date/datetime/missing due dates, as Classroom returns them) and
+times `generate_weekly_plan` against the previous sort-everything implementation.
+
+    cd backend && python3 benchmarks/bench_planner.py [assignments] [rounds]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.models.schemas import Assignment, PlanItem, WeeklyPlan, new_id, week_start_iso  # noqa: E402
+from app.services.planner import (  # noqa: E402
+    MAX_PLAN_ITEMS,
+    _due_date_sort_key,
+    _plan_item_title,
+    _split_minutes,
+    generate_weekly_plan,
+)
+
+
+def _full_sort_plan(assignments, *, today: date, cap_items: int = MAX_PLAN_ITEMS) -> WeeklyPlan:
+    ordered = sorted(list(assignments), key=lambda a: (_due_date_sort_key(a.dueDate), a.title.lower()))
+    items: list[PlanItem] = []
+    for a in ordered:
+        parts = _split_minutes(a.estimatedMinutes)
+        for part_idx, mins in enumerate(parts, start=1):
+            if len(items) >= cap_items:
+                break
+            items.append(
+                PlanItem(
+                    id=new_id(),
+                    title=_plan_item_title(a.title, mins, part_idx=part_idx, total_parts=len(parts)),
+                    dueDate=a.dueDate,
+                    estimatedMinutes=mins,
+                    status="todo",
+                    sourceAssignmentId=a.id,
+                )
+            )
+        if len(items) >= cap_items:
+            break
+    return WeeklyPlan(weekStart=week_start_iso(today), items=items)
+
+
+def _assignments(n: int) -> list[Assignment]:
+    rng = random.Random(42)
+    out = []
+    for i in range(n):
+        day = date.fromordinal(date(2024, 1, 1).toordinal() + rng.randrange(900))
+        due = rng.choice([day.isoformat(), f"{day.isoformat()}T23:59:00Z", None])
+        out.append(
+            Assignment(
+                id=f"a{i}",
+                title=f"Assignment {i}",
+                dueDate=due,
+                courseName=f"Course {i % 12}",
+                estimatedMinutes=rng.choice([None, 15, 30, 60]),
+            )
+        )
+    return out
+
+
+def _best_ms(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main(n: int, rounds: int) -> None:
+    assignments = _assignments(n)
+    today = date(2026, 1, 14)
+
+    def strip(plan: WeeklyPlan) -> list[tuple]:
+        return [(i.title, i.dueDate, i.estimatedMinutes, i.sourceAssignmentId) for i in plan.items]
+
+    assert strip(generate_weekly_plan(assignments, today=today)) == strip(
+        _full_sort_plan(assignments, today=today)
+    )
+    for label, fn in (
+        ("full sort", lambda: _full_sort_plan(assignments, today=today)),
+        ("top-k heap", lambda: generate_weekly_plan(assignments, today=today)),
+    ):
+        print(f"{label:<10} assignments={n} best_ms={_best_ms(fn, rounds):.2f} rounds={rounds}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    )
@@ -5,4 +5,46 @@ from pathlib import Path
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(BACKEND_ROOT))
 
+import pytest  # noqa: E402
 
+from app.core import db as db_module  # noqa: E402
+from app.core import metrics  # noqa: E402
+from app.core.auth import session_cache  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.http import breakers  # noqa: E402
+from app.core.token_store import token_store  # noqa: E402
+from app.services.assignment_cache import assignment_cache  # noqa: E402
+from app.services import assignment_source as assignment_source_module  # noqa: E402
+from app.services import planning as planning_module  # noqa: E402
+from app.services.assignment_source import classroom_loads  # noqa: E402
+from app.services.llm_cache import llm_plan_cache  # noqa: E402
+from app.services.pkce_store import pkce_store  # noqa: E402
+from app.services.rate_limit import classroom_limiter  # noqa: E402
+from app.services.token_refresher import token_refresher  # noqa: E402
+
+
+def _reset_shared_state() -> None:
+    get_settings.cache_clear()
+    assignment_cache.clear()
+    classroom_loads.reset()
+    token_store.cache.clear()
+    token_refresher.reset()
+    llm_plan_cache.clear()
+    assignment_source_module._fixture_cache.clear()
+    planning_module._anonymous_plans.clear()
+    session_cache.clear()
+    pkce_store.clear()
+    classroom_limiter.reset()
+    for breaker in breakers.values():
+        breaker.reset()
+    metrics.reset()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    # Tests tweak env vars and fake upstreams; don't let cached state leak between them.
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "test.sqlite3"))
+    _reset_shared_state()
+    yield
+    db_module.close_all()
+    _reset_shared_state()
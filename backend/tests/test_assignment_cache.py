@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.models.schemas import Assignment
+from app.services import assignment_source as assignment_source_module
+from app.services.assignment_cache import AssignmentCache, assignment_cache
+
+
+def _assignment(aid: str) -> Assignment:
+    return Assignment(id=aid, title=f"Task {aid}", dueDate=None, courseName="Course")
+
+
+@pytest.fixture
+def fetches(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    async def fake_fetch(user_id: str):
+        calls.append(user_id)
+        return [_assignment(f"v{len(calls)}")]
+
+    monkeypatch.setattr(assignment_source_module, "fetch_classroom_assignments", fake_fetch)
+    return calls
+
+
+def test_second_call_is_cache_hit(fetches: list[str]) -> None:
+    async def run():
+        first = await assignment_source_module.select_assignments("u1")
+        second = await assignment_source_module.select_assignments("u1")
+        return first, second
+
+    (a1, m1), (a2, m2) = asyncio.run(run())
+    assert m1["cache"] == "miss" and m2["cache"] == "hit"
+    assert m2["used_classroom"] is True and m2["used_fixture"] is False
+    assert [a.id for a in a2] == [a.id for a in a1]
+    assert fetches == ["u1"]
+
+
+def test_stale_entry_served_then_refreshed_in_background(
+    monkeypatch: pytest.MonkeyPatch, fetches: list[str]
+) -> None:
+    monkeypatch.setenv("ASSIGNMENT_CACHE_TTL_SECONDS", "0")
+    assignment_cache.put("u1", [_assignment("old")])
+
+    async def run():
+        assignments, meta = await assignment_source_module.select_assignments("u1")
+        await asyncio.sleep(0.01)  # let the background refresh finish
+        return assignments, meta
+
+    assignments, meta = asyncio.run(run())
+    assert meta["cache"] == "stale"
+    assert [a.id for a in assignments] == ["old"]
+    assert fetches == ["u1"]
+    assert [a.id for a in assignment_cache.get("u1")[0]] == ["v1"]
+
+
+def test_invalidate_forces_refetch_and_blocks_late_writes() -> None:
+    cache = AssignmentCache(ttl_seconds=60, max_stale_seconds=60)
+    cache.put("u1", [_assignment("a")])
+    generation = cache.generation("u1")
+    cache.invalidate("u1")
+    assert cache.get("u1") == (None, "miss")
+
+    # A refresh that started before invalidation must not repopulate the entry.
+    cache.put("u1", [_assignment("late")], generation=generation)
+    assert cache.get("u1") == (None, "miss")
@@ -0,0 +1,37 @@
+import sys
+from datetime import date, datetime, timezone
+
+from app.models.records import AssignmentRecord, parse_due
+from app.models.schemas import Assignment
+from app.services.classroom import _normalize_coursework
+from app.services.planner import generate_weekly_plan
+
+
+def test_due_dates_are_parsed_once_up_front() -> None:
+    assert parse_due("2026-01-20") == datetime(2026, 1, 20)
+    assert parse_due("2026-01-20T08:30:00Z") == datetime(2026, 1, 20, 8, 30, tzinfo=timezone.utc)
+    assert parse_due("soon") is None and parse_due(None) is None
+
+    (record,) = _normalize_coursework(
+        [{"id": "w1", "title": "Lab", "dueDate": {"year": 2026, "month": 2, "day": 3}}],
+        "".join(["Bio", "logy"]),
+    )
+    assert record.due_at == datetime(2026, 2, 3, tzinfo=timezone.utc)
+    assert record.dueDate == "2026-02-03T00:00:00+00:00"
+    assert record.courseName is sys.intern("Biology")  # one string object per course name
+
+
+def test_records_round_trip_and_plan_like_models() -> None:
+    models = [
+        Assignment(id="a", title="Essay", dueDate="2026-01-22T10:00:00Z", courseName="English", estimatedMinutes=45),
+        Assignment(id="b", title="Lab", dueDate="2026-01-21", courseName="Bio", description="Read ch. 2"),
+        Assignment(id="c", title="Quiz prep", dueDate=None, courseName="Math"),
+    ]
+    records = [AssignmentRecord.from_model(a) for a in models]
+    assert [r.to_model() for r in records] == models
+
+    def shape(plan):
+        return [(i.title, i.dueDate, i.estimatedMinutes, i.sourceAssignmentId) for i in plan.items]
+
+    today = date(2026, 1, 19)
+    assert shape(generate_weekly_plan(records, today=today)) == shape(generate_weekly_plan(models, today=today))
@@ -64,3 +64,40 @@ def test_chat_instructions_includes_assignment_description(monkeypatch):
     assert "Test material the students will use" in body["assistant_message"]["text"]
 
 
+def test_chat_instructions_fetch_assignments_once(monkeypatch):
+    os.environ.pop("OPENAI_API_KEY", None)
+    os.environ["SESSION_SECRET"] = "test-secret"
+    # No assignment cache, so a second lookup would go upstream again.
+    monkeypatch.setenv("ASSIGNMENT_CACHE_TTL_SECONDS", "0")
+    monkeypatch.setenv("ASSIGNMENT_CACHE_MAX_STALE_SECONDS", "0")
+    get_settings.cache_clear()
+
+    from app.models.schemas import Assignment
+    from app.services import assignment_source as assignment_source_module
+
+    fetches = []
+
+    async def fake_fetch(user_id):
+        fetches.append(user_id)
+        return [
+            Assignment(
+                id="a1",
+                title="Homework 1A",
+                dueDate=None,
+                courseName="Math",
+                description="Test material the students will use.",
+            )
+        ]
+
+    monkeypatch.setattr(assignment_source_module, "fetch_classroom_assignments", fake_fetch)
+
+    token = issue_session_token("u1")
+    client = TestClient(app)
+    r = client.post(
+        "/chat/send",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"user_message": "What are the instructions?"},
+    )
+    assert r.status_code == 200
+    assert "Test material the students will use" in r.json()["assistant_message"]["text"]
+    assert fetches == ["u1"]
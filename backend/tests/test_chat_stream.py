@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.routes.chat as chat_route
+from app.main import app
+
+
+_PAYLOAD = {
+    "user_message": "Help me get started",
+    "current_plan": {
+        "weekStart": "2026-01-12",
+        "items": [
+            {
+                "id": "p1",
+                "title": "Start English essay draft: 15 min",
+                "dueDate": None,
+                "estimatedMinutes": 15,
+                "status": "todo",
+                "sourceAssignmentId": None,
+            }
+        ],
+    },
+}
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    out = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+def test_stream_sends_action_first_then_deltas(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_stream(user_message, title, minutes):
+        yield "You've got this. "
+        yield f"{title} for {minutes} minutes."
+
+    monkeypatch.setattr(chat_route, "coach_text_stream", fake_stream)
+
+    r = TestClient(app).post("/chat/send/stream", json=_PAYLOAD)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _events(r.text)
+    assert [e for e, _ in events] == ["best_next_action", "delta", "delta", "done"]
+    assert events[0][1]["id"] == "p1"
+    done = events[-1][1]
+    assert done["assistant_message"]["text"] == (
+        "You've got this. Start English essay draft: 15 min for 15 minutes."
+    )
+    assert done["best_next_action"]["id"] == "p1"
+
+
+def test_stream_failure_midway_emits_deterministic_fallback(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def broken_stream(user_message, title, minutes):
+        yield "Partial"
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(chat_route, "coach_text_stream", broken_stream)
+
+    r = TestClient(app).post("/chat/send/stream", json=_PAYLOAD)
+    events = _events(r.text)
+    assert [e for e, _ in events] == ["best_next_action", "delta", "fallback", "done"]
+    expected = "Do this now: Start English essay draft: 15 min. Set a 15-minute timer and start."
+    assert events[2][1]["text"] == expected
+    assert events[-1][1]["assistant_message"]["text"] == expected
+
+
+def test_coach_text_stream_parses_responses_api_events(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    import httpx
+
+    from app.services import openai_client
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    body = (
+        'event: response.output_text.delta\ndata: {"type": "response.output_text.delta", "delta": "Hi"}\n\n'
+        'event: response.output_text.delta\ndata: {"type": "response.output_text.delta", "delta": " there"}\n\n'
+        'event: response.completed\ndata: {"type": "response.completed"}\n\n'
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw)
+    )
+
+    async def collect() -> list[str]:
+        return [d async for d in openai_client.coach_text_stream("hi", "Start X: 15 min", 15)]
+
+    assert asyncio.run(collect()) == ["Hi", " there"]
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.circuit import CircuitOpenError, is_upstream_failure
+from app.core.http import GOOGLE, OPENAI, breakers
+from app.services import classroom as classroom_module
+from app.services import planning as planning_module
+from app.services import token_refresher as token_refresher_module
+from app.services.openai_client import plan_week
+
+
+def _patch_upstream(monkeypatch: pytest.MonkeyPatch, responses: list) -> list[str]:
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        outcome = responses.pop(0) if responses else 200
+        if outcome == "down":
+            raise httpx.ConnectError("connection refused", request=request)
+        body = {"output": [{"content": [{"type": "output_text", "text": "{}"}]}]}
+        return httpx.Response(outcome, json=body)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw)
+    )
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def _openai(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD", "2")
+
+
+def test_open_circuit_fails_fast_then_probe_closes_it(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _patch_upstream(monkeypatch, ["down", 503])
+
+    async def attempt() -> None:
+        await plan_week("[]", "2026-01-12")
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPError):
+            asyncio.run(attempt())
+    assert breakers[OPENAI].state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(attempt())
+    assert len(calls) == 2  # the open circuit never reached the network
+
+    monkeypatch.setenv("CIRCUIT_RESET_SECONDS", "0")
+    planning_module.get_settings.cache_clear()
+    asyncio.run(attempt())  # half-open probe succeeds
+    assert breakers[OPENAI].state == "closed" and len(calls) == 3
+
+
+def test_failed_probe_reopens(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CIRCUIT_RESET_SECONDS", "0")
+    _patch_upstream(monkeypatch, ["down", "down", "down"])
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(plan_week("[]", "2026-01-12"))
+    assert breakers[OPENAI].state == "open" and breakers[OPENAI].opened == 2
+
+
+def test_open_circuits_make_fallbacks_instant(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _patch_upstream(monkeypatch, [])
+    for name in (GOOGLE, OPENAI):
+        breakers[name].state = "open"
+        breakers[name].opened_at = time.monotonic()
+
+    async def fake_tokens(_user_id):
+        return {"access_token": "at", "refresh_token": "rt", "expires_at": None}
+
+    monkeypatch.setattr(classroom_module.token_store, "get", fake_tokens)
+
+    started = time.perf_counter()
+    _, meta = asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id="u1"))
+    assert time.perf_counter() - started < 0.5
+    assert meta["planner"] == "deterministic" and meta["used_fixture"] is True
+    assert calls == []
+
+
+def test_hanging_coursework_opens_the_google_circuit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CLASSROOM_COURSE_TIMEOUT_SECONDS", "0.05")
+
+    async def fake_tokens(_user_id):
+        return {"access_token": "at", "refresh_token": "rt", "expires_at": None}
+
+    async def fake_list_courses(_client, _access_token, **_kwargs):
+        return [{"id": "c1", "name": "Course c1"}, {"id": "c2", "name": "Course c2"}]
+
+    async def hanging_pages(_client, _access_token, _course_id, **_kwargs):
+        await asyncio.sleep(5)
+        yield []
+
+    monkeypatch.setattr(classroom_module.token_store, "get", fake_tokens)
+    monkeypatch.setattr(classroom_module, "_list_courses", fake_list_courses)
+    monkeypatch.setattr(classroom_module, "_iter_coursework_pages", hanging_pages)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError, match="google_timeout"):
+            asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+    assert breakers[GOOGLE].state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+
+
+def test_token_endpoint_errors_count_as_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GOOGLE_CLIENT_ID", "cid")
+    _patch_upstream(monkeypatch, [503, 503])
+
+    for _ in range(2):
+        # Callers still see a failed refresh; the breaker sees Google failing.
+        with pytest.raises(PermissionError, match="refresh_failed"):
+            asyncio.run(token_refresher_module._refresh_access_token("u1", "rt"))
+    assert breakers[GOOGLE].state == "open"
+
+
+def test_only_upstream_trouble_counts_as_failure() -> None:
+    request = httpx.Request("GET", "https://example.test")
+
+    def status_error(code: int) -> httpx.HTTPStatusError:
+        return httpx.HTTPStatusError("x", request=request, response=httpx.Response(code, request=request))
+
+    assert is_upstream_failure(status_error(503)) and is_upstream_failure(status_error(429))
+    assert is_upstream_failure(httpx.ReadTimeout("slow", request=request))
+    assert not is_upstream_failure(status_error(401))
+    assert not is_upstream_failure(PermissionError("no_tokens"))
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import classroom as classroom_module
+
+
+def _patch_upstream(monkeypatch: pytest.MonkeyPatch, delays: dict[str, float]) -> None:
+    async def fake_get_tokens(_user_id):
+        return {"access_token": "at", "refresh_token": "rt", "expires_at": None}
+
+    monkeypatch.setattr(classroom_module.token_store, "get", fake_get_tokens)
+
+    async def fake_list_courses(_client, _access_token, **_kwargs):
+        return [{"id": cid, "name": f"Course {cid}"} for cid in delays]
+
+    async def fake_coursework_pages(_client, _access_token, course_id, **_kwargs):
+        await asyncio.sleep(delays[course_id])
+        yield [{"id": f"w{course_id}", "title": f"Work {course_id}"}]
+
+    monkeypatch.setattr(classroom_module, "_list_courses", fake_list_courses)
+    monkeypatch.setattr(classroom_module, "_iter_coursework_pages", fake_coursework_pages)
+
+
+def test_coursework_fetched_concurrently_in_course_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CLASSROOM_MAX_CONCURRENCY", "8")
+    get_settings.cache_clear()
+    _patch_upstream(monkeypatch, {"c1": 0.2, "c2": 0.05, "c3": 0.1, "c4": 0.2})
+
+    started = time.perf_counter()
+    out = asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+    elapsed = time.perf_counter() - started
+
+    assert [a.id for a in out] == ["wc1", "wc2", "wc3", "wc4"]
+    assert [a.courseName for a in out] == ["Course c1", "Course c2", "Course c3", "Course c4"]
+    assert elapsed < 0.45
+
+
+def test_slow_course_is_skipped_after_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CLASSROOM_COURSE_TIMEOUT_SECONDS", "0.1")
+    get_settings.cache_clear()
+    _patch_upstream(monkeypatch, {"c1": 0.0, "slow": 5.0, "c3": 0.0})
+
+    started = time.perf_counter()
+    out = asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+
+    assert [a.id for a in out] == ["wc1", "wc3"]
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,48 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import classroom as classroom_module
+
+
+def _work(wid: str, day: int) -> dict:
+    return {"id": wid, "title": f"Work {wid}", "dueDate": {"year": 2026, "month": 1, "day": day}}
+
+
+# Two courses; c1 has three pages of courseWork (newest due date first), c2 has one.
+_PAGES = {
+    ("courses", None): {"courses": [{"id": "c1", "name": "Math"}], "nextPageToken": "cp2"},
+    ("courses", "cp2"): {"courses": [{"id": "c2", "name": "Art"}]},
+    ("c1", None): {"courseWork": [_work("m1", 28), _work("m2", 25)], "nextPageToken": "p2"},
+    ("c1", "p2"): {"courseWork": [_work("m3", 20), _work("m4", 10)], "nextPageToken": "p3"},
+    ("c1", "p3"): {"courseWork": [_work("m5", 5)]},
+    ("c2", None): {"courseWork": [_work("a1", 22)]},
+}
+
+
+@pytest.fixture
+def requested(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    seen: list[tuple] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.split("/")
+        key = ("courses" if parts[-1] == "courses" else parts[-2], request.url.params.get("pageToken"))
+        seen.append(key)
+        return httpx.Response(200, json=_PAGES[key])
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw)
+    )
+    async def fake_get_tokens(_user_id):
+        return {"access_token": "at", "refresh_token": "rt", "expires_at": None}
+
+    monkeypatch.setattr(classroom_module.token_store, "get", fake_get_tokens)
+    return seen
+
+
+def test_fetch_reads_every_page(requested: list[tuple]) -> None:
+    out = asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+    assert [a.id for a in out] == ["m1", "m2", "m3", "m4", "m5", "a1"]
+    assert ("c1", "p3") in requested
@@ -0,0 +1,125 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import classroom as classroom_module
+from app.services.assignment_source import invalidate_assignments
+
+
+def _work(wid: str, title: str, updated: str) -> dict:
+    return {
+        "id": wid,
+        "title": title,
+        "dueDate": {"year": 2026, "month": 1, "day": 20},
+        "updateTime": updated,
+    }
+
+
+class FakeClassroom:
+    def __init__(self) -> None:
+        self.courses = [{"id": "c1", "name": "Math"}, {"id": "c2", "name": "Art"}]
+        # Newest updateTime first, as requested with orderBy=updateTime desc.
+        self.work = {
+            "c1": [
+                _work("m2", "Quiz", "2026-01-02T00:00:00.5Z"),
+                _work("m1", "Homework", "2026-01-01T00:00:00Z"),
+            ],
+            "c2": [_work("a1", "Sketch", "2026-01-01T00:00:00Z")],
+        }
+        self.coursework_items_served = 0
+        self.requests = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        parts = request.url.path.split("/")
+        if parts[-1] == "courses":
+            return httpx.Response(200, json={"courses": self.courses})
+        assert request.url.params["orderBy"] == "updateTime desc"
+        # One item per page so we can see where an incremental pass stops.
+        items = self.work[parts[-2]]
+        idx = int(request.url.params.get("pageToken") or 0)
+        if idx >= len(items):
+            return httpx.Response(200, json={})
+        self.coursework_items_served += 1
+        body = {"courseWork": [items[idx]]}
+        if idx + 1 < len(items):
+            body["nextPageToken"] = str(idx + 1)
+        return httpx.Response(200, json=body)
+
+
+@pytest.fixture
+def google(monkeypatch: pytest.MonkeyPatch) -> FakeClassroom:
+    fake = FakeClassroom()
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(fake.handler), **kw)
+    )
+
+    async def fake_get_tokens(_user_id):
+        return {"access_token": "at", "refresh_token": "rt", "expires_at": None}
+
+    monkeypatch.setattr(classroom_module.token_store, "get", fake_get_tokens)
+    return fake
+
+
+def _titles(user_id: str = "u1") -> list[str]:
+    return [a.title for a in asyncio.run(classroom_module.fetch_classroom_assignments(user_id))]
+
+
+def test_warm_store_is_served_without_calling_google(google: FakeClassroom) -> None:
+    assert sorted(_titles()) == ["Homework", "Quiz", "Sketch"]
+    requests = google.requests
+    assert sorted(_titles()) == ["Homework", "Quiz", "Sketch"]
+    assert google.requests == requests
+
+
+def test_incremental_sync_pulls_only_changed_items(
+    google: FakeClassroom, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("CLASSROOM_SYNC_MAX_AGE_SECONDS", "0")
+    _titles()
+    assert google.coursework_items_served == 3
+
+    google.work["c1"].insert(0, _work("m1", "Homework v2", "2026-01-03T00:00:00Z"))
+    google.coursework_items_served = 0
+    titles = _titles()
+
+    # c1: the edited item, then stop at the first known one; c2: one known item.
+    assert google.coursework_items_served == 3
+    assert sorted(titles) == ["Homework v2", "Quiz", "Sketch"]
+
+
+def test_full_sync_drops_deleted_work_and_removed_courses(
+    google: FakeClassroom, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("CLASSROOM_SYNC_MAX_AGE_SECONDS", "0")
+    _titles()
+
+    monkeypatch.setenv("CLASSROOM_FULL_SYNC_INTERVAL_SECONDS", "0")
+    classroom_module.get_settings.cache_clear()
+    google.work["c1"] = [google.work["c1"][0]]
+    google.courses = [{"id": "c1", "name": "Mathematics"}]
+
+    out = asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+    assert [(a.title, a.courseName) for a in out] == [("Quiz", "Mathematics")]
+
+
+def test_store_is_served_when_google_fails_after_a_sync(
+    google: FakeClassroom, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("CLASSROOM_SYNC_MAX_AGE_SECONDS", "0")
+    _titles()
+    google.handler = lambda request: httpx.Response(500)  # type: ignore[method-assign]
+    assert sorted(_titles()) == ["Homework", "Quiz", "Sketch"]
+
+
+def test_invalidate_makes_the_next_load_sync(google: FakeClassroom) -> None:
+    _titles()
+    # E.g. a new grant can now see a course that was 403 before.
+    google.courses.append({"id": "c3", "name": "Bio"})
+    google.work["c3"] = [_work("b1", "Lab", "2026-01-01T00:00:00Z")]
+    assert "Lab" not in _titles()
+
+    asyncio.run(invalidate_assignments("u1"))
+    assert "Lab" in _titles()
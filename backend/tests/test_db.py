@@ -0,0 +1,54 @@
+import threading
+
+from app.core import db as db_module
+
+
+def _upsert(user_id: str, access_token: str, refresh_token=None) -> None:
+    db_module.upsert_tokens(
+        user_id=user_id,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_at=123,
+        token_type="Bearer",
+        scope=None,
+        id_token=None,
+    )
+
+
+def test_connection_reused_per_thread_with_wal() -> None:
+    conn = db_module.get_conn()
+    assert db_module.get_conn() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    other: list = []
+    t = threading.Thread(target=lambda: other.append(db_module.get_conn()))
+    t.start()
+    t.join()
+    assert other[0] is not conn
+
+
+def test_upsert_keeps_refresh_token_and_concurrent_writers_succeed() -> None:
+    _upsert("u1", "a1", refresh_token="r1")
+    _upsert("u1", "a2")
+    tok = db_module.get_tokens("u1")
+    assert tok["access_token"] == "a2"
+    assert tok["refresh_token"] == "r1"
+
+    errors: list[Exception] = []
+
+    def writer(i: int) -> None:
+        try:
+            for j in range(20):
+                _upsert(f"user{i}", f"token{j}")
+                db_module.get_tokens("u1")
+        except Exception as e:  # pragma: no cover - surfaced by the assert below
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert db_module.get_tokens("user3")["access_token"] == "token19"
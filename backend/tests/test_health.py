@@ -7,6 +7,11 @@ def test_health_ok() -> None:
     client = TestClient(app)
     r = client.get("/health")
     assert r.status_code == 200
-    assert r.json() == {"status": "ok"}
+    body = r.json()
+    assert body["status"] == "ok"
+    assert {name: c["state"] for name, c in body["circuits"].items()} == {
+        "google": "closed",
+        "openai": "closed",
+    }
 
 
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import planning as planning_module
+
+
+_PLAN = json.dumps(
+    {
+        "weekStart": "2026-01-12",
+        "items": [{"id": "llm1", "title": "Start Essay: 15 min", "estimatedMinutes": 15, "status": "todo"}],
+    }
+)
+
+
+@pytest.fixture
+def hedged(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("PLANNER_MODE", "hedged")
+    monkeypatch.setenv("PLANNER_DEADLINE_SECONDS", "0.1")
+
+
+def _llm(monkeypatch: pytest.MonkeyPatch, *, delay: float, fail: bool = False) -> None:
+    async def fake_plan_week(*_args) -> str:
+        await asyncio.sleep(delay)
+        if fail:
+            raise ConnectionError("openai down")
+        return _PLAN
+
+    monkeypatch.setattr(planning_module, "plan_week", fake_plan_week)
+
+
+def test_fast_llm_wins_within_budget(hedged, monkeypatch: pytest.MonkeyPatch) -> None:
+    _llm(monkeypatch, delay=0.0)
+    plan, meta = asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id=None))
+    assert meta["planner"] == "llm"
+    assert meta["hedge"]["winner"] == "llm"
+    assert meta["hedge"]["margin_ms"] > 0
+    assert plan.items[0].id == "llm1"
+
+
+def test_slow_llm_loses_then_populates_cache(hedged, monkeypatch: pytest.MonkeyPatch) -> None:
+    _llm(monkeypatch, delay=0.3)
+
+    async def run():
+        first = await planning_module.generate_weekly_plan_with_fallback(user_id=None)
+        await asyncio.sleep(0.4)  # background LLM call finishes and fills the cache
+        second = await planning_module.generate_weekly_plan_with_fallback(user_id=None)
+        return first, second
+
+    (plan1, meta1), (plan2, meta2) = asyncio.run(run())
+    assert meta1["planner"] == "deterministic"
+    assert meta1["hedge"]["reason"] == "deadline"
+    assert plan1.items
+    assert meta2["planner"] == "llm"
+    assert plan2.items[0].id == "llm1"
+
+
+def test_failing_llm_falls_back_without_waiting_for_deadline(
+    hedged, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("PLANNER_DEADLINE_SECONDS", "5")
+    _llm(monkeypatch, delay=0.0, fail=True)
+    _plan, meta = asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id=None))
+    assert meta["planner"] == "deterministic"
+    assert meta["hedge"]["reason"] == "llm_failed"
+    assert meta["hedge"]["margin_ms"] < 1000
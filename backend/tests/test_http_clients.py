@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from app.core import http as http_module
+from app.main import app
+
+
+def test_lifespan_opens_and_closes_shared_clients() -> None:
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        shared = dict(http_module._clients)
+        assert set(shared) == {http_module.GOOGLE, http_module.OPENAI}
+        assert all(not c.is_closed for c in shared.values())
+
+    assert http_module._clients == {}
+    assert all(c.is_closed for c in shared.values())
+
+
+def test_only_opted_in_upstream_calls_are_capped(monkeypatch) -> None:
+    import asyncio
+
+    monkeypatch.setenv("GOOGLE_MAX_CONCURRENCY", "2")
+    running = {"now": 0, "max": 0}
+
+    async def call(capped: bool) -> None:
+        if capped:
+            http_module.cap_upstream_calls()
+        async with http_module.upstream_client(http_module.GOOGLE):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+
+    async def run(capped: bool) -> int:
+        running["max"] = 0
+        await http_module.start_http_clients()
+        try:
+            await asyncio.gather(*(call(capped) for _ in range(6)))
+        finally:
+            await http_module.close_http_clients()
+        return running["max"]
+
+    assert asyncio.run(run(capped=True)) == 2
+    # Interactive traffic (no opt-in) is never queued behind the cap.
+    assert asyncio.run(run(capped=False)) == 6
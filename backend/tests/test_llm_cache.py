@@ -0,0 +1,89 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from app.core.config import get_settings
+from app.services import planning as planning_module
+from app.services.llm_cache import LLMPlanCache, llm_plan_cache
+
+
+_PLAN = json.dumps(
+    {
+        "weekStart": "2026-01-12",
+        "items": [{"id": "p1", "title": "Start Essay: 15 min", "estimatedMinutes": 15, "status": "todo"}],
+    }
+)
+
+
+@pytest.fixture
+def llm_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    calls: list[str] = []
+
+    async def fake_plan_week(assignments_json: str, week_start: str) -> str:
+        calls.append(week_start)
+        return _PLAN
+
+    monkeypatch.setattr(planning_module, "plan_week", fake_plan_week)
+    return calls
+
+
+def test_identical_inputs_skip_the_llm(llm_calls: list[str]) -> None:
+    for _ in range(3):
+        # refresh=True skips the per-day anonymous plan memo, so each call reaches the planner.
+        plan, meta = asyncio.run(
+            planning_module.generate_weekly_plan_with_fallback(user_id=None, refresh=True)
+        )
+        assert meta["planner"] == "llm"
+        assert [i.id for i in plan.items] == ["p1"]
+    assert len(llm_calls) == 1
+    stats = llm_plan_cache.stats()
+    assert stats["memory_hits"] == 2 and stats["misses"] == 1
+
+
+def test_model_change_misses(llm_calls: list[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id=None))
+    monkeypatch.setenv("OPENAI_MODEL", "another-model")
+    planning_module.get_settings.cache_clear()
+    asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id=None))
+    assert len(llm_calls) == 2
+
+
+def test_disk_tier_survives_a_fresh_process(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path / "llm"))
+    key = LLMPlanCache.key("m", "prompt")
+    asyncio.run(LLMPlanCache().put(key, _PLAN))
+
+    fresh = LLMPlanCache()
+    assert asyncio.run(fresh.get(key)) == _PLAN
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_expired_entries_miss(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LLM_CACHE_TTL_SECONDS", "-1")
+    cache = LLMPlanCache()
+    asyncio.run(cache.put("k", _PLAN))
+    assert asyncio.run(cache.get("k")) is None
+
+
+def test_disk_tier_is_bounded_and_drops_expired_files(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    directory = tmp_path / "llm"
+    monkeypatch.setenv("LLM_CACHE_DIR", str(directory))
+    monkeypatch.setenv("LLM_CACHE_DISK_MAX_ENTRIES", "3")
+    cache = LLMPlanCache()
+    for i in range(5):
+        asyncio.run(cache.put(f"k{i}", _PLAN))
+        # Distinct mtimes so "oldest" is well defined.
+        os.utime(directory / f"k{i}.json", (time.time() - 100 + i, time.time() - 100 + i))
+
+    asyncio.run(cache.put("k5", _PLAN))
+    assert sorted(p.name for p in directory.glob("*.json")) == ["k3.json", "k4.json", "k5.json"]
+
+    # An expired file found on read is removed rather than left behind.
+    monkeypatch.setenv("LLM_CACHE_TTL_SECONDS", "-1")
+    get_settings.cache_clear()
+    assert asyncio.run(LLMPlanCache().get("k5")) is None
+    assert not (directory / "k5.json").exists()
@@ -0,0 +1,84 @@
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import logging as app_logging
+from app.core.config import get_settings
+from app.core.logging import log_event, request_id_var
+from app.main import app
+
+
+@pytest.fixture
+def capture_logs():
+    # Restart the writer thread on a buffer; stopping it flushes everything queued.
+    def start():
+        app_logging.shutdown_logging()
+        get_settings.cache_clear()
+        buf = io.StringIO()
+        app_logging.setup_logging(stream=buf)
+
+        def lines() -> list[str]:
+            app_logging.shutdown_logging()
+            return buf.getvalue().splitlines()
+
+        return lines
+
+    yield start
+    app_logging.shutdown_logging()
+
+
+def test_key_value_lines_keep_the_old_print_format(capture_logs) -> None:
+    captured = capture_logs()
+    log_event("assignments_source", used_classroom=True, used_fixture=False, fallback_reason="none", cache="miss")
+    log_event("classroom_fanout", courses=3, wall_ms=12)
+
+    assert captured() == [
+        "assignments_source used_classroom=true used_fixture=false fallback_reason=none cache=miss",
+        "classroom_fanout courses=3 wall_ms=12",
+    ]
+
+
+def test_json_format_and_request_id(capture_logs, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LOG_FORMAT", "json")
+    captured = capture_logs()
+    token = request_id_var.set("req-1")
+    try:
+        log_event("plan_store", ok=False, fallback_reason="read_failed")
+    finally:
+        request_id_var.reset(token)
+
+    (line,) = captured()
+    out = json.loads(line)
+    assert out["event"] == "plan_store"
+    assert out["ok"] is False
+    assert out["fallback_reason"] == "read_failed"
+    assert out["request_id"] == "req-1"
+
+
+def test_sampling_drops_routine_events_but_keeps_fallbacks(capture_logs, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LOG_SAMPLE_RATES", "assignments_source=0, classroom_retry=bogus")
+    captured = capture_logs()
+    for _ in range(20):
+        log_event("assignments_source", used_fixture=True, fallback_reason="none")
+    log_event("assignments_source", used_fixture=False, fallback_reason="using_stub")
+    log_event("classroom_retry", status=429)
+
+    assert captured() == [
+        "assignments_source used_fixture=false fallback_reason=using_stub",
+        "classroom_retry status=429",
+    ]
+
+
+def test_request_id_header_is_echoed_or_generated() -> None:
+    client = TestClient(app)
+
+    r = client.get("/health", headers={"X-Request-ID": "abc-123"})
+    assert r.headers["x-request-id"] == "abc-123"
+
+    # Anything that could break a log line is replaced with a fresh id.
+    r = client.get("/health", headers={"X-Request-ID": "bad id x=1"})
+    generated = r.headers["x-request-id"]
+    assert generated != "bad id x=1"
+    assert len(generated) == 16
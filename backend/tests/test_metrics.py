@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.main import app
+from app.services import assignment_source as assignment_source_module
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    h = metrics.Histogram("t_seconds", "Test.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        h.observe(value, "x")
+    text = "\n".join(h.render())
+    assert 't_seconds_bucket{stage="x",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="x",le="1"} 3' in text
+    assert 't_seconds_bucket{stage="x",le="+Inf"} 4' in text
+    assert 't_seconds_count{stage="x"} 4' in text and 't_seconds_sum{stage="x"} 4.05' in text
+
+
+def test_stage_records_outcome() -> None:
+    with metrics.stage("demo"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.stage("demo"):
+            raise ValueError("boom")
+    assert metrics.stage_seconds.count("demo", "ok") == 1
+    assert metrics.stage_seconds.count("demo", "error") == 1
+
+
+def test_metrics_endpoint_reports_stages_fallbacks_and_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def failing_fetch(_user_id):
+        raise ConnectionError("google_unreachable")
+
+    monkeypatch.setattr(assignment_source_module, "fetch_classroom_assignments", failing_fetch)
+    monkeypatch.setenv("SESSION_SECRET", "test-secret")
+    from app.core.auth import issue_session_token
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {issue_session_token('u1')}"}
+    assert client.post("/chat/send", headers=headers, json={"user_message": "hi"}).status_code == 200
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert "# TYPE studybuddy_stage_duration_seconds histogram" in body
+    assert 'studybuddy_stage_duration_seconds_count{stage="rails",outcome="ok"} 1' in body
+    assert 'studybuddy_fallbacks_total{component="assignments",reason="classroom_failed"} 1' in body
+    assert 'studybuddy_fallbacks_total{component="chat",reason="coach_failed"} 1' in body
+    assert "studybuddy_circuit_google_open 0" in body
+    assert "studybuddy_token_cache_hits " in body
@@ -95,3 +95,47 @@ def test_classroom_empty_uses_fixture(monkeypatch: pytest.MonkeyPatch) -> None:
     assert meta["used_fixture"] is True
 
 
+def test_fixture_is_parsed_once_until_it_changes(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    import json
+    import os
+
+    fixture = tmp_path / "assignments.json"
+    fixture.write_text(json.dumps([{"id": "f1", "title": "Read", "courseName": "English"}]))
+    monkeypatch.setattr(assignment_source_module, "FIXTURE_PATH", fixture)
+    parses = []
+    real_loads = assignment_source_module.json.loads
+    monkeypatch.setattr(
+        assignment_source_module.json, "loads", lambda s: parses.append(1) or real_loads(s)
+    )
+
+    first, _ = asyncio.run(assignment_source_module.select_assignments(None))
+    second, _ = asyncio.run(assignment_source_module.select_assignments(None))
+    assert [a.id for a in first] == [a.id for a in second] == ["f1"]
+    assert len(parses) == 1
+
+    fixture.write_text(json.dumps([{"id": "f2", "title": "Write", "courseName": "English"}]))
+    os.utime(fixture, ns=(1, 1))  # mtime changes even on coarse-timestamp filesystems
+    third, meta = asyncio.run(assignment_source_module.select_assignments(None))
+    assert [a.id for a in third] == ["f2"] and meta["used_fixture"] is True
+    assert len(parses) == 2
+
+
+def test_anonymous_plan_is_memoized_per_day() -> None:
+    from datetime import date
+
+    async def run(today):
+        return await planning_module.generate_weekly_plan_with_fallback(user_id=None, today=today)
+
+    day = date(2026, 1, 14)
+    first, m1 = asyncio.run(run(day))
+    second, m2 = asyncio.run(run(day))
+    assert m1["plan_source"] == "generated" and m2["plan_source"] == "memo"
+    assert [i.id for i in second.items] == [i.id for i in first.items]
+
+    second.items[0].status = "done"  # callers get copies
+    third, _ = asyncio.run(run(day))
+    assert third.items[0].status == "todo"
+
+    _, m4 = asyncio.run(run(date(2026, 1, 15)))
+    assert m4["plan_source"] == "generated"
+    assert len(planning_module._anonymous_plans) == 1
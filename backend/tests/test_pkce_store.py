@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import pkce_store as pkce_module
+from app.services.pkce_store import PKCEStore, SQLitePKCEStore
+
+
+def test_memory_store_is_single_use_and_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(pkce_module.time, "monotonic", lambda: clock[0])
+    store = PKCEStore(ttl_seconds=10)
+    store.put("s1", "v1")
+    clock[0] += 5
+    store.put("s2", "v2")
+    assert store.pop("s1") == "v1"
+    assert store.pop("s1") is None
+
+    clock[0] += 7  # s2 still live, then expires
+    assert len(store) == 1
+    clock[0] += 10
+    store.put("s3", "v3")  # cleanup drops s2 from the front
+    assert len(store) == 1
+    assert store.pop("s2") is None
+
+
+def test_memory_store_capacity_drops_oldest() -> None:
+    store = PKCEStore(max_entries=3)
+    for i in range(5):
+        store.put(f"s{i}", f"v{i}")
+    assert len(store) == 3
+    assert store.pop("s0") is None and store.pop("s1") is None
+    assert store.pop("s4") == "v4"
+
+
+def test_sqlite_store_is_shared_bounded_and_single_use() -> None:
+    writer, reader = SQLitePKCEStore(max_entries=2), SQLitePKCEStore()
+    writer.put("a", "va")
+    writer.put("b", "vb")
+    writer.put("c", "vc")
+    assert reader.pop("a") is None  # evicted at capacity
+    assert reader.pop("c") == "vc"
+    assert reader.pop("c") is None
+
+    SQLitePKCEStore(ttl_seconds=-1).put("old", "v")
+    assert reader.pop("old") is None
+
+
+def test_callback_accepts_state_from_sqlite_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PKCE_STORE_BACKEND", "sqlite")
+    monkeypatch.setenv("GOOGLE_CLIENT_ID", "cid")
+    monkeypatch.setenv("GOOGLE_REDIRECT_URI", "http://127.0.0.1:8000/auth/google/callback")
+    client = TestClient(app)
+
+    state = client.get("/auth/google/start").json()["state"]
+    assert len(pkce_module.pkce_store) == 0  # nothing kept in this process
+    assert pkce_module.sqlite_pkce_store.pop(state)
+
+    r = client.get("/auth/google/callback", params={"code": "c", "state": state})
+    assert r.status_code == 400 and r.json()["detail"] == "Invalid state"
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.schemas import WeeklyPlan
+from app.services import plan_batch as plan_batch_module
+
+
+def _post(client: TestClient, user_ids: list[str], key: str = "admin-key"):
+    return client.post("/plan/batch", headers={"X-Admin-Key": key}, json={"user_ids": user_ids})
+
+
+def test_batch_requires_admin_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = TestClient(app)
+    assert _post(client, ["u1"]).status_code == 403  # no key configured
+
+    monkeypatch.setenv("ADMIN_API_KEY", "admin-key")
+    from app.core.config import get_settings
+
+    get_settings.cache_clear()
+    assert _post(client, ["u1"], key="wrong").status_code == 401
+    assert client.post("/plan/batch", json={"user_ids": ["u1"]}).status_code == 401
+
+
+def test_batch_streams_ndjson_with_bounded_concurrency(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ADMIN_API_KEY", "admin-key")
+    monkeypatch.setenv("PLAN_BATCH_MAX_CONCURRENCY", "3")
+    running = {"now": 0, "max": 0}
+
+    async def fake_plan(*, user_id, refresh=False):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.2 if user_id == "slow" else 0.01)
+        running["now"] -= 1
+        if user_id == "broken":
+            raise RuntimeError("boom")
+        plan = WeeklyPlan(weekStart="2026-01-12", items=[])
+        return plan, {"planner": "deterministic", "plan_source": "generated", "used_classroom": False}
+
+    monkeypatch.setattr(plan_batch_module, "generate_weekly_plan_with_fallback", fake_plan)
+
+    user_ids = ["slow"] + [f"u{i}" for i in range(8)] + ["broken", "u1"]
+    r = _post(TestClient(app), user_ids)
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert sorted(row["user_id"] for row in rows) == sorted(set(user_ids))
+    assert rows[-1]["user_id"] == "slow"  # completion order, not input order
+    assert next(row for row in rows if row["user_id"] == "broken") == {
+        "user_id": "broken",
+        "ok": False,
+        "error": "RuntimeError",
+    }
+    assert rows[0]["ok"] is True and rows[0]["plan"]["weekStart"] == "2026-01-12"
+    assert running["max"] == 3
+
+
+def test_batch_rejects_oversized_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ADMIN_API_KEY", "admin-key")
+    monkeypatch.setenv("PLAN_BATCH_MAX_USERS", "2")
+    assert _post(TestClient(app), ["a", "b", "c"]).status_code == 422
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.auth import issue_session_token
+from app.main import app
+from app.models.schemas import Assignment
+from app.services import planning as planning_module
+
+
+@pytest.fixture
+def assignments(monkeypatch: pytest.MonkeyPatch) -> list[Assignment]:
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    current = [Assignment(id="a1", title="Essay", dueDate="2026-01-20", courseName="English")]
+
+    async def fake_select(_user_id):
+        return list(current), {"used_classroom": True, "used_fixture": False, "cache": "hit"}
+
+    monkeypatch.setattr(planning_module, "select_assignments", fake_select)
+    return current
+
+
+def _plan(**kwargs):
+    return asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id="u1", **kwargs))
+
+
+def test_plan_is_reused_until_assignments_change(assignments: list[Assignment]) -> None:
+    first, meta1 = _plan()
+    second, meta2 = _plan()
+    assert meta1["plan_source"] == "generated"
+    assert meta2["plan_source"] == "store"
+    assert [i.id for i in second.items] == [i.id for i in first.items]
+
+    assignments.append(Assignment(id="a2", title="Lab", dueDate="2026-01-21", courseName="Chem"))
+    third, meta3 = _plan()
+    assert meta3["plan_source"] == "generated"
+    assert {i.sourceAssignmentId for i in third.items} == {"a1", "a2"}
+
+
+def test_refresh_regenerates(assignments: list[Assignment]) -> None:
+    first, _ = _plan()
+    again, meta = _plan(refresh=True)
+    assert meta["plan_source"] == "generated"
+    assert [i.id for i in again.items] != [i.id for i in first.items]
+
+
+def test_llm_fallback_is_not_stored(assignments: list[Assignment], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    planning_module.get_settings.cache_clear()
+    outcomes = [RuntimeError("llm down"), None]
+
+    async def flaky_plan_week(_assignments_json: str, week_start: str) -> str:
+        error = outcomes.pop(0)
+        if error is not None:
+            raise error
+        item = {"id": "p1", "title": "Start Essay: 15 min", "estimatedMinutes": 15, "status": "todo"}
+        return json.dumps({"weekStart": week_start, "items": [item]})
+
+    monkeypatch.setattr(planning_module, "plan_week", flaky_plan_week)
+
+    _, meta = _plan()
+    assert (meta["planner"], meta["plan_source"]) == ("deterministic", "generated")
+    # The LLM is retried on the next request instead of serving the stored fallback.
+    _, meta = _plan()
+    assert (meta["planner"], meta["plan_source"]) == ("llm", "generated")
+    _, meta = _plan()
+    assert (meta["planner"], meta["plan_source"]) == ("llm", "store")
+
+
+def test_anonymous_plans_are_not_stored(assignments: list[Assignment]) -> None:
+    _, meta = asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id=None))
+    _, meta = asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id=None))
+    # Reused from the in-memory per-day memo, never from the per-user store.
+    assert meta["plan_source"] == "memo"
+    _, meta = asyncio.run(planning_module.generate_weekly_plan_with_fallback(user_id=None, refresh=True))
+    assert meta["plan_source"] == "generated"
+
+
+def test_plan_week_route_honours_refresh(
+    assignments: list[Assignment], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SESSION_SECRET", "test-secret")
+    headers = {"Authorization": f"Bearer {issue_session_token('u1')}"}
+    client = TestClient(app)
+    ids1 = [i["id"] for i in client.get("/plan/week", headers=headers).json()["items"]]
+    ids2 = [i["id"] for i in client.get("/plan/week", headers=headers).json()["items"]]
+    ids3 = [i["id"] for i in client.get("/plan/week?refresh=true", headers=headers).json()["items"]]
+    assert ids1 == ids2
+    assert ids3 != ids1
@@ -63,3 +63,37 @@ def test_planner_sorting_respects_due_date() -> None:
     assert plan.items[2].sourceAssignmentId == "none"
 
 
+def _reference_plan_order(assignments: list[Assignment], cap_items: int) -> list[tuple]:
+    # The planner before top-k selection: full stable sort, then fill up to cap_items.
+    from app.services.planner import _due_date_sort_key, _split_minutes
+
+    ordered = sorted(assignments, key=lambda a: (_due_date_sort_key(a.dueDate), a.title.lower()))
+    out: list[tuple] = []
+    for a in ordered:
+        for mins in _split_minutes(a.estimatedMinutes):
+            if len(out) >= cap_items:
+                return out
+            out.append((a.id, a.dueDate, mins))
+    return out
+
+
+def test_planner_top_k_matches_full_sort() -> None:
+    import random
+
+    rng = random.Random(7)
+    dues = [None, "", "not-a-date", "2026-01-20", "2026-01-20T08:00:00Z", "2026-01-19T23:30:00+00:00"]
+    dues += [f"2026-0{m}-{d:02d}" for m in (1, 2, 3) for d in range(1, 29, 3)]
+    for cap in (0, 1, 5, MAX_PLAN_ITEMS, 400):
+        many = [
+            Assignment(
+                id=f"a{i}",
+                title=rng.choice(["Essay", "essay", "Lab", "Quiz", f"Task {i % 7}"]),
+                dueDate=rng.choice(dues),
+                courseName="Course",
+                estimatedMinutes=rng.choice([None, 5, 15, 45, 120]),
+            )
+            for i in range(300)
+        ]
+        plan = generate_weekly_plan(many, cap_items=cap)
+        got = [(i.sourceAssignmentId, i.dueDate, i.estimatedMinutes) for i in plan.items]
+        assert got == _reference_plan_order(many, cap)
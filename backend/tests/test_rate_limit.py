@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import classroom as classroom_module
+from app.services.rate_limit import RateLimiter, classroom_limiter
+
+
+def _limiter(global_rate=0.0, per_user=10.0, burst=1.0, max_wait=1.0) -> RateLimiter:
+    return RateLimiter("test", lambda: (global_rate, burst, per_user, burst, max_wait))
+
+
+def test_calls_queue_within_the_per_user_rate() -> None:
+    limiter = _limiter()
+
+    async def run() -> float:
+        started = time.perf_counter()
+        await asyncio.gather(*(limiter.acquire("u1") for _ in range(3)), limiter.acquire("u2"))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(run())
+    assert 0.18 <= elapsed < 0.5  # u1: now, +0.1s, +0.2s; u2 has its own bucket
+    stats = limiter.stats()
+    assert stats["throttled"] == 2 and stats["max_queue_depth"] == 2 and stats["queue_depth"] == 0
+
+
+def test_wait_is_bounded_and_global_bucket_is_shared() -> None:
+    limiter = _limiter(global_rate=1.0, per_user=0.0, max_wait=0.5)
+
+    async def run() -> None:
+        await limiter.acquire("u1")
+        with pytest.raises(ConnectionError, match="test_throttled"):
+            await limiter.acquire("u2")
+
+    asyncio.run(run())
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_retry_delay_honours_retry_after() -> None:
+    assert classroom_module._retry_delay("2", 0) == 2.0
+    assert 29 <= classroom_module._retry_delay(_http_date(30), 0) <= 30
+    assert all(0 <= classroom_module._retry_delay(None, 2) <= 2.0 for _ in range(50))
+
+
+def _http_date(seconds_from_now: int) -> str:
+    from email.utils import formatdate
+
+    return formatdate(time.time() + seconds_from_now, usegmt=True)
+
+
+def _patch_google(monkeypatch: pytest.MonkeyPatch, statuses: list[int]) -> list[int]:
+    served: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/courses"):
+            status = statuses.pop(0) if statuses else 200
+            served.append(status)
+            if status != 200:
+                return httpx.Response(status, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"courses": [{"id": "c1", "name": "Math"}]})
+        return httpx.Response(200, json={"courseWork": [{"id": "w1", "title": "Essay"}]})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx, "AsyncClient", lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw)
+    )
+
+    async def fake_get_tokens(_user_id):
+        return {"access_token": "at", "refresh_token": "rt", "expires_at": None}
+
+    monkeypatch.setattr(classroom_module.token_store, "get", fake_get_tokens)
+    return served
+
+
+def test_429_is_retried_then_succeeds(monkeypatch: pytest.MonkeyPatch) -> None:
+    served = _patch_google(monkeypatch, [429, 503])
+    out = asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+    assert [a.id for a in out] == ["w1"]
+    assert served == [429, 503, 200]
+    assert classroom_limiter.stats()["retries"] == 2
+
+
+def test_persistent_429_still_fails_as_upstream_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CLASSROOM_RETRY_ATTEMPTS", "2")
+    served = _patch_google(monkeypatch, [429] * 10)
+    with pytest.raises(ConnectionError, match="google_http_error"):
+        asyncio.run(classroom_module.fetch_classroom_assignments("u1"))
+    assert len(served) == 3
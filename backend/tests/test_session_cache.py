@@ -0,0 +1,72 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import auth as auth_module
+from app.core.auth import issue_session_token, session_cache, verify_session_token
+from app.core.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def _secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SESSION_SECRET", "test-secret")
+
+
+def test_serializer_is_built_once_per_secret() -> None:
+    assert auth_module._serializer() is auth_module._serializer()
+
+
+def test_repeat_verifications_are_cache_hits() -> None:
+    token = issue_session_token("u1")
+    assert verify_session_token(token) == "u1"
+    assert verify_session_token(token) == "u1"
+    assert session_cache.stats()["hits"] == 1 and session_cache.stats()["misses"] == 1
+
+    with pytest.raises(HTTPException):
+        verify_session_token(token + "x")
+
+
+def test_cache_never_extends_max_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    token = issue_session_token("u1")
+    assert verify_session_token(token, max_age_seconds=60) == "u1"
+
+    real_time = time.time
+    monkeypatch.setattr(auth_module.time, "time", lambda: real_time() + 120)
+    with pytest.raises(HTTPException):
+        verify_session_token(token, max_age_seconds=60)
+
+
+def test_revocation_and_secret_rotation_evict(monkeypatch: pytest.MonkeyPatch) -> None:
+    token = issue_session_token("u1")
+    verify_session_token(token)
+    auth_module.revoke_user_sessions("u1")
+    assert session_cache.stats()["size"] == 0
+
+    verify_session_token(token)
+    monkeypatch.setenv("SESSION_SECRET", "rotated")
+    get_settings.cache_clear()
+    with pytest.raises(HTTPException):
+        verify_session_token(token)
+
+
+def test_concurrent_verification_with_evictions(monkeypatch: pytest.MonkeyPatch) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    # The auth dependencies run on threadpool threads; a tiny cache makes evictions constant.
+    monkeypatch.setenv("SESSION_CACHE_MAX_ENTRIES", "4")
+    get_settings.cache_clear()
+    tokens = [(f"u{i}", issue_session_token(f"u{i}")) for i in range(16)]
+
+    def hammer(offset: int) -> bool:
+        ok = True
+        for n in range(300):
+            user_id, token = tokens[(offset + n) % len(tokens)]
+            ok &= verify_session_token(token) == user_id
+            if n % 50 == 0:
+                auth_module.revoke_user_sessions(user_id)
+        return ok
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(hammer, range(8)))
+    assert session_cache.stats()["size"] <= 4
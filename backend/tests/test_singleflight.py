@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.models.schemas import Assignment
+from app.services import assignment_source as assignment_source_module
+from app.services.assignment_source import classroom_loads
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_select_assignments_share_one_fetch(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    async def fake_fetch(user_id: str):
+        calls.append(user_id)
+        await asyncio.sleep(0.05)
+        return [Assignment(id="a1", title="Task", dueDate=None, courseName="Course")]
+
+    monkeypatch.setattr(assignment_source_module, "fetch_classroom_assignments", fake_fetch)
+
+    async def run():
+        return await asyncio.gather(
+            *(assignment_source_module.select_assignments("u1") for _ in range(3))
+        )
+
+    results = asyncio.run(run())
+    assert calls == ["u1"]
+    assert all(meta["used_classroom"] for _, meta in results)
+    assert classroom_loads.stats()["coalesced"] == 2
+
+
+def test_error_reaches_every_waiter_and_does_not_stick() -> None:
+    flight = SingleFlight()
+    attempts: list[int] = []
+
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise ConnectionError("boom")
+        return "ok"
+
+    async def run():
+        first = await asyncio.gather(*(flight.do("k", flaky) for _ in range(3)), return_exceptions=True)
+        second = await flight.do("k", flaky)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert all(isinstance(r, ConnectionError) for r in first)
+    assert second == "ok"
+    assert len(attempts) == 2
+    assert flight.stats() == {"calls": 2, "coalesced": 2, "inflight": 0}
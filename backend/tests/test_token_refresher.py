@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.token_store import token_store
+from app.services import token_refresher as token_refresher_module
+from app.services.token_refresher import token_refresher
+
+
+def _store(user_id: str, *, expires_in: int) -> None:
+    asyncio.run(
+        token_store.upsert(
+            user_id=user_id,
+            access_token="old",
+            refresh_token="rt",
+            expires_at=int(time.time()) + expires_in,
+            token_type="Bearer",
+            scope=None,
+            id_token=None,
+        )
+    )
+
+
+@pytest.fixture
+def refresh_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    async def fake_refresh(user_id: str, refresh_token: str) -> str:
+        calls.append(user_id)
+        await asyncio.sleep(0.02)
+        await token_store.upsert(
+            user_id=user_id,
+            access_token="new",
+            refresh_token=None,
+            expires_at=int(time.time()) + 3600,
+            token_type="Bearer",
+            scope=None,
+            id_token=None,
+        )
+        return "new"
+
+    monkeypatch.setattr(token_refresher_module, "_refresh_access_token", fake_refresh)
+    return calls
+
+
+def test_concurrent_refreshes_for_one_user_hit_google_once(refresh_calls: list[str]) -> None:
+    _store("u1", expires_in=10)
+
+    async def run():
+        return await asyncio.gather(
+            *(token_refresher.ensure_fresh("u1", min_valid_seconds=60) for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["new"] * 5
+    assert refresh_calls == ["u1"]
+
+    # Token is now good for an hour: no further refresh.
+    assert asyncio.run(token_refresher.ensure_fresh("u1", min_valid_seconds=60)) == "new"
+    assert refresh_calls == ["u1"]
+
+
+def test_background_pass_refreshes_only_active_users_near_expiry(refresh_calls: list[str]) -> None:
+    _store("soon", expires_in=120)
+    _store("later", expires_in=7200)
+    _store("idle", expires_in=120)
+    token_refresher.mark_active("soon")
+    token_refresher.mark_active("later")
+
+    assert asyncio.run(token_refresher.refresh_due()) == 1
+    assert refresh_calls == ["soon"]
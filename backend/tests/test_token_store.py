@@ -0,0 +1,167 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import get_settings
+from app.core.db import get_tokens
+from app.core.db_executor import DBExecutor, db_executor
+from app.core.token_store import TokenCache, token_store
+
+
+def _fields(user_id: str, access_token: str, refresh_token=None) -> dict:
+    return dict(
+        user_id=user_id,
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_at=123,
+        token_type="Bearer",
+        scope=None,
+        id_token=None,
+    )
+
+
+def test_async_upsert_then_get_round_trips() -> None:
+    async def run():
+        await token_store.upsert(**_fields("u1", "a1", refresh_token="r1"))
+        await token_store.upsert(**_fields("u1", "a2"))
+        return await token_store.get("u1")
+
+    tok = asyncio.run(run())
+    assert tok["access_token"] == "a2"
+    assert tok["refresh_token"] == "r1"
+
+
+def _insert(i: int):
+    return lambda conn: conn.execute(
+        "INSERT INTO oauth_tokens (user_id, access_token) VALUES (?, ?)", (f"u{i}", "t")
+    )
+
+
+def test_writes_queued_behind_a_slow_write_commit_as_one_group() -> None:
+    executor = DBExecutor()
+    batch_sizes: list[int] = []
+    commit = executor._commit
+
+    def spy(batch):
+        batch_sizes.append(len(batch))
+        commit(batch)
+
+    executor._commit = spy  # type: ignore[method-assign]
+
+    def slow(conn):
+        time.sleep(0.1)
+
+    async def run():
+        first = asyncio.create_task(executor.write(slow))
+        await asyncio.sleep(0.02)
+        await asyncio.gather(first, *(executor.write(_insert(i)) for i in range(10)))
+
+    try:
+        asyncio.run(run())
+    finally:
+        executor.close()
+
+    assert batch_sizes == [1, 10]
+    assert all(get_tokens(f"u{i}") for i in range(10))
+
+
+def test_failed_write_does_not_fail_its_group() -> None:
+    executor = DBExecutor()
+
+    def bad(conn):
+        conn.execute("INSERT INTO no_such_table VALUES (1)")
+
+    async def run():
+        writes = [executor.write(_insert(i)) for i in range(5)] + [executor.write(bad)]
+        return await asyncio.gather(*writes, return_exceptions=True)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        executor.close()
+
+    assert sum(isinstance(r, Exception) for r in results) == 1
+    assert all(get_tokens(f"u{i}") for i in range(5))
+
+
+def test_unopenable_database_fails_writes_instead_of_hanging(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    (tmp_path / "not-a-dir").write_text("")
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "not-a-dir" / "db.sqlite3"))
+    get_settings.cache_clear()
+    executor = DBExecutor()
+
+    async def run():
+        writes = [executor.write(_insert(i)) for i in range(2)]
+        return await asyncio.wait_for(asyncio.gather(*writes, return_exceptions=True), timeout=3)
+
+    try:
+        results = asyncio.run(run())
+        assert all(isinstance(r, OSError) for r in results)
+
+        # The writer survives and picks up once the database can be opened.
+        monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "ok.sqlite3"))
+        get_settings.cache_clear()
+        asyncio.run(executor.write(_insert(7)))
+    finally:
+        executor.close()
+    assert get_tokens("u7")
+
+
+def test_token_io_does_not_block_the_event_loop() -> None:
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        t = asyncio.create_task(ticker())
+        for i in range(50):
+            await token_store.upsert(**_fields(f"u{i}", "a"))
+            await token_store.get(f"u{i}")
+        t.cancel()
+        return ticks
+
+    assert asyncio.run(run()) > 0
+
+
+def test_reads_are_served_from_cache_after_write_through(monkeypatch) -> None:
+    async def run():
+        await token_store.upsert(**_fields("u1", "a1", refresh_token="r1"))
+        await token_store.upsert(**_fields("u1", "a2"))
+
+        async def no_db(*_args):
+            raise AssertionError("cache should have served this read")
+
+        monkeypatch.setattr(db_executor, "read", no_db)
+        return await token_store.get("u1")
+
+    tok = asyncio.run(run())
+    assert tok["access_token"] == "a2"
+    assert tok["refresh_token"] == "r1"
+    assert token_store.cache.stats()["hits"] == 1
+
+
+def test_cache_is_bounded_and_counts_evictions() -> None:
+    cache = TokenCache(max_entries=2)
+    for uid in ("a", "b", "c"):
+        cache.write(uid, {"user_id": uid, "access_token": "t", "refresh_token": "r"})
+    assert cache.get("a") is None
+    assert cache.get("c") is not None
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_stale_read_does_not_overwrite_newer_write() -> None:
+    cache = TokenCache(max_entries=10)
+    seen = cache.writes
+    cache.write("u1", {"user_id": "u1", "access_token": "new", "refresh_token": "r"})
+    cache.fill("u1", {"user_id": "u1", "access_token": "old", "refresh_token": "r"}, writes_seen=seen)
+    assert cache.get("u1")["access_token"] == "new"